@@ -4,21 +4,24 @@ cs_annotator_app.py (Stage 2.1). No tkinter import — callable and testable
 independent of a running GUI."""
 
 import re
+import sys
+from array import array
+
+
+# MatrixLang/EmbedLang match exactly; the SentenceID family is matched
+# lowercased, so mixed-case spellings of those still hit.
+_META_TOKENS = frozenset({
+    "MatrixLang", "EmbedLang", "sentenceid", "sentid", "sentence_id", "sent_id",
+})
 
 
 def is_meta_row_token(tok: str) -> bool:
     """Rows that should NOT be counted as tokens for numbering."""
     if tok is None:
         return False
-    t = str(tok).strip()
-    if not t:
-        # blank rows are structural/editable placeholders
-        return True
-    if t in ("MatrixLang", "EmbedLang"):
-        return True
-    if t.lower() in ("sentenceid", "sentid", "sentence_id", "sent_id"):
-        return True
-    return False
+    t = tok.strip() if isinstance(tok, str) else str(tok).strip()
+    # blank rows are structural/editable placeholders
+    return not t or t in _META_TOKENS or t.lower() in _META_TOKENS
 
 
 def freq_normalize_token(tok: str):
@@ -112,17 +115,92 @@ def sheet_rows_to_txt(rows, headers):
 
 def renumber_tokens(blocks):
     """Assign sequential token ids only to non-meta rows."""
-    g = 1
-    for rows in blocks:
-        for r in rows:
-            tok = r.get("token", "")
-            if is_meta_row_token(tok):
+    renumber_tokens_from(blocks, [], 0)
+
+
+def renumber_tokens_from(blocks, g_at, start_bidx=0):
+    """Incremental renumber_tokens. Blocks before start_bidx are taken as
+    unchanged since the previous call, so numbering resumes at g_at[start_bidx]
+    instead of walking them again. g_at (one entry per block: the first id
+    handed out in that block) is updated in place. Falls back to a full pass
+    when g_at doesn't cover start_bidx."""
+    if 0 < start_bidx < len(g_at):
+        g = g_at[start_bidx]
+    else:
+        start_bidx, g = 0, 1
+    del g_at[start_bidx:]
+    is_meta = is_meta_row_token
+    for bidx in range(start_bidx, len(blocks)):
+        g_at.append(g)
+        for r in blocks[bidx]:
+            if is_meta(r.get("token", "")):
                 r["idx"] = ""
                 continue
             r["idx"] = g
             g += 1
 
 
+# "token LABEL" lines in annotator output that carry no tab separators
+LABEL_LINE_RE = re.compile(r"^(\S+)\s+(TR|EN|MIXED|UID|NE|OTHER|LANG3)\s*$")
+
+
+def _parse_annotated_line(ln):
+    """(token, label) for one stripped output line, or None if it isn't a row."""
+    parts = ln.split("\t", 3)
+    if len(parts) == 2:
+        return parts[0].strip(), parts[1].strip()
+    if len(parts) > 2:
+        return parts[1].strip(), parts[2].strip()
+    m = LABEL_LINE_RE.match(ln)
+    if m:
+        return m.group(1), m.group(2)
+    return None
+
+
+def iter_annotated_blocks(text, extra_headers):
+    """Parse annotator TXT output into blocks of row dicts, one block at a time.
+
+    Blocks are the pieces text.split("\n\n") would give and each block's lines
+    are its splitlines(), but the text is walked once with str.find instead of
+    materializing those lists. Rows are {"idx": 0, "token", "label", "gloss": ""}
+    plus an empty value per extra header; labels are interned.
+    """
+    extra_blank = dict.fromkeys(extra_headers, "")
+    intern = sys.intern
+    find = text.find
+    n = len(text)
+    rows = []
+    pos = 0
+    first = True
+    prev_boundary = False
+    while True:
+        nl = find("\n", pos)
+        end = n if nl < 0 else nl
+        # an empty line between two newlines is a "\n\n" boundary, unless its
+        # leading newline was already used up by the previous boundary
+        if pos == end and not first and nl >= 0 and not prev_boundary:
+            yield rows
+            rows = []
+            prev_boundary = True
+        else:
+            prev_boundary = False
+            if pos != end:
+                for ln in text[pos:end].splitlines():
+                    ln = ln.strip()
+                    if not ln:
+                        continue
+                    parsed = _parse_annotated_line(ln)
+                    if parsed is None:
+                        continue
+                    token, label = parsed
+                    rows.append({"idx": 0, "token": token, "label": intern(label), "gloss": "", **extra_blank})
+        if nl < 0:
+            break
+        pos = nl + 1
+        first = False
+    yield rows
+
+
 def reconstruct_text_from_blocks(blocks, extra_headers):
     """Fallback TXT reconstruction from the Python model.
 
@@ -130,31 +208,35 @@ def reconstruct_text_from_blocks(blocks, extra_headers):
     Trailing empty fields are trimmed.
     """
     renumber_tokens(blocks)
-    out_blocks = []
-    for rows in blocks:
-        lines = []
+    # every line goes into one list; a block boundary is one empty entry, and
+    # a block with no lines contributes a single "" (as "\n".join([]) would)
+    out = []
+    append = out.append
+    for bi, rows in enumerate(blocks):
+        if bi:
+            append("")
+        start = len(out)
         for r in rows:
-            idx = str(r.get('idx', '') or '').strip()
             tok = str(r.get('token', '') or '')
-            lab = str(r.get('label', '') or '')
-            glo = str(r.get('gloss', '') or '')
-
             if not tok:
                 continue
-
-            extras = [str(r.get(h, '') or '') for h in extra_headers]
+            idx = str(r.get('idx', '') or '').strip()
+            lab = str(r.get('label', '') or '')
+            glo = str(r.get('gloss', '') or '')
 
             if idx == "":
-                fields = [tok, lab, glo] + extras
+                fields = [tok, lab, glo]
             else:
-                fields = [idx, tok, lab, glo] + extras
+                fields = [idx, tok, lab, glo]
+            fields.extend([str(r.get(h, '') or '') for h in extra_headers])
 
-            while fields and str(fields[-1]).strip() == "":
+            while fields and not fields[-1].strip():
                 fields.pop()
 
-            lines.append("\t".join(fields))
-        out_blocks.append("\n".join(lines))
-    return "\n\n".join(out_blocks)
+            append("\t".join(fields))
+        if len(out) == start:
+            append("")
+    return "\n".join(out)
 
 
 def is_matrixembed_locked(token, new_value) -> bool:
@@ -184,37 +266,111 @@ def iter_visible_rows(blocks, row_index_map, sep_rows):
         yield vis_r, bidx, ridx, row
 
 
-def build_grid_view(blocks, extra_headers, skip_separator_after_empty_block):
-    """Build tksheet-ready row data plus row_index_map/sep_rows from blocks.
-    Returns (data, row_index_map, sep_rows).
+def iter_visible_rows_from_arrays(blocks, row_bidx, row_ridx, sep_flags=None):
+    """iter_visible_rows over the parallel row arrays from build_grid_arrays,
+    without materializing a dict/set view. Separator rows carry bidx -1;
+    rows flagged in sep_flags are skipped too."""
+    for vis_r, bidx in enumerate(row_bidx):
+        if bidx < 0 or (sep_flags is not None and sep_flags[vis_r]):
+            continue
+        ridx = row_ridx[vis_r]
+        yield vis_r, bidx, ridx, blocks[bidx][ridx]
+
+
+def build_grid_arrays(blocks, extra_headers, skip_separator_after_empty_block):
+    """Build tksheet-ready row data plus the visible-row -> model-row mapping
+    as two parallel int arrays. Returns (data, row_bidx, row_ridx, sep_rows);
+    row_bidx[r]/row_ridx[r] are -1 on separator rows.
 
     A separator row is inserted after every block except the last.
     If skip_separator_after_empty_block is True, that separator is
     additionally skipped when the block itself has no rows.
     """
-    data = []
-    row_index_map = {}
+    extras = tuple(extra_headers)
+    blank = [""] * (4 + len(extras))
+    last = len(blocks) - 1
+    # upper bound; trimmed below if separators after empty blocks are skipped
+    total = sum(map(len, blocks)) + max(0, last)
+    data = [None] * total
+    row_bidx = array("i", [-1]) * total
+    row_ridx = array("i", [-1]) * total
     sep_rows = set()
-    row_cursor = 0
+    i = 0
     for bidx, rows in enumerate(blocks):
         for ridx, r in enumerate(rows):
-            for h in extra_headers:
+            for h in extras:
                 r.setdefault(h, "")
             idxv = r.get("idx", "")
-            idxs = "" if idxv is None else str(idxv)
-            vals = [idxs, r.get("token", ""), r.get("label", ""), r.get("gloss", "")]
-            for h in extra_headers:
-                vals.append(r.get(h, ""))
-            data.append(vals)
-            row_index_map[row_cursor] = (bidx, ridx)
-            row_cursor += 1
-
-        is_last = bidx == len(blocks) - 1
-        insert_sep = (not is_last) and (bool(rows) if skip_separator_after_empty_block else True)
-        if insert_sep:
-            data.append(["" for _ in range(4 + len(extra_headers))])
-            row_index_map[row_cursor] = (None, None)
-            sep_rows.add(row_cursor)
-            row_cursor += 1
-
-    return data, row_index_map, sep_rows
+            data[i] = [
+                "" if idxv is None else str(idxv),
+                r.get("token", ""),
+                r.get("label", ""),
+                r.get("gloss", ""),
+                *[r[h] for h in extras],
+            ]
+            row_bidx[i] = bidx
+            row_ridx[i] = ridx
+            i += 1
+
+        if bidx != last and (rows or not skip_separator_after_empty_block):
+            # tksheet keeps a reference to the rows, so each separator gets its own list
+            data[i] = blank[:]
+            sep_rows.add(i)
+            i += 1
+
+    if i < total:
+        del data[i:], row_bidx[i:], row_ridx[i:]
+    return data, row_bidx, row_ridx, sep_rows
+
+
+def row_index_map_from_arrays(row_bidx, row_ridx):
+    """Expand the parallel row_bidx/row_ridx arrays into the
+    {visible_row: (bidx, ridx)} dict used by resolve_row/iter_visible_rows."""
+    return {
+        vis_r: (None, None) if b < 0 else (b, row_ridx[vis_r])
+        for vis_r, b in enumerate(row_bidx)
+    }
+
+
+def build_grid_view(blocks, extra_headers, skip_separator_after_empty_block):
+    """Build tksheet-ready row data plus row_index_map/sep_rows from blocks.
+    Returns (data, row_index_map, sep_rows).
+
+    Same grid as build_grid_arrays, with the row mapping as a dict.
+    """
+    data, row_bidx, row_ridx, sep_rows = build_grid_arrays(
+        blocks, extra_headers, skip_separator_after_empty_block
+    )
+    return data, row_index_map_from_arrays(row_bidx, row_ridx), sep_rows
+
+
+def shift_grid_arrays(row_bidx, row_ridx, sep_rows, at_row, delta, bidx, ridx=-1):
+    """Patch row_bidx/row_ridx/sep_rows in place after a single model row of
+    block `bidx`, shown at visible row `at_row`, was inserted (delta=+1, as
+    row `ridx` of that block) or removed (delta=-1), so the grid doesn't have
+    to be rebuilt from scratch.
+
+    Every visible row after `at_row` moves by `delta`; the following rows of
+    the same block additionally get their ridx shifted, since they index into
+    the list that changed length. sep_rows may be None if the caller tracks
+    separators some other way.
+    """
+    if delta > 0:
+        row_bidx.insert(at_row, bidx)
+        row_ridx.insert(at_row, ridx)
+        k = at_row + 1
+    else:
+        del row_bidx[at_row]
+        del row_ridx[at_row]
+        k = at_row
+    n = len(row_bidx)
+    while k < n and row_bidx[k] == bidx:
+        row_ridx[k] += delta
+        k += 1
+
+    if sep_rows is None:
+        return
+    moved = {s for s in sep_rows if s >= at_row}
+    if moved:
+        sep_rows -= moved
+        sep_rows |= {s + delta for s in moved}
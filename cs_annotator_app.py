@@ -9,6 +9,8 @@ import re
 import csv
 import json
 import sys
+from array import array
+from bisect import bisect_left
 
 from cs_pipeline import Annotator, DEFAULTS
 import annotation_model
@@ -27,8 +29,18 @@ APP_DIR = os.path.join(os.path.expanduser("~"), ".cs_annotator")
 LAST_PROJECT_PTR = os.path.join(APP_DIR, "last_project.json")
 PROJECT_EXT = ".trenproj"
 
+# "token LABEL" lines in annotator output that carry no tab separators
+_LABEL_RE = annotation_model.LABEL_LINE_RE
+# meta lines, matched as a prefix like str.startswith
+_MATRIX_RE = re.compile(r"^(MatrixLang|EmbedLang)")
+
 
 class App(tk.Tk):
+    # fixed grid columns (0 is the read-only idx column, extras start at 4)
+    _COL_ITEM = 1
+    _COL_LABEL = 2
+    _COL_GLOSS = 3
+
     def _set_runtime_workdir(self):
         """
         Ensure relative resource paths resolve correctly.
@@ -161,8 +173,8 @@ VOC vocative
                     continue
             return ""
 
-        for vis_r, bidx, ridx, row in annotation_model.iter_visible_rows(
-            self.blocks, getattr(self, '_row_index_map', {}), getattr(self, '_sep_rows', set())
+        for vis_r, bidx, ridx, row in annotation_model.iter_visible_rows_from_arrays(
+            self.blocks, self._row_bidx, self._row_ridx, self._sep_flags
         ):
             tok = str(row.get('token', '') or '').strip()
             if self._is_meta_row_token(tok):
@@ -501,8 +513,14 @@ VOC vocative
 
         # tablw model
         self.blocks = []
-        self._row_index_map = {}
-        self._sep_rows = set()
+        self._row_bidx = array("i")  # visible row -> block index (-1 on separators)
+        self._row_ridx = array("i")  # visible row -> row index within that block
+        self._sep_flags = bytearray()  # _sep_flags[r] == 1 for separator rows
+        self._sep_rows_sorted = []  # separator rows in ascending order
+        self._first_real_r = None  # first non-separator visible row
+        self._refresh_pending = False  # a coalesced sheet refresh is queued
+        self._renum_dirty = None  # earliest block whose token ids need redoing
+        self._renum_g_at = []  # first token id handed out in each block
 
 
         self._core_headers = ["Token", "Item", "Label", "Gloss"]
@@ -532,6 +550,7 @@ VOC vocative
         self._conc_win = None
         self._sentence_win = None
         self._freq_win = None
+        self._freq_items = []  # (token, count, label breakdown) rows shown in the frequency list
         self._ag_win = None
 
         # concordance (KWIC) state
@@ -542,6 +561,10 @@ VOC vocative
         self._conc_tree = None
         self._conc_count_var = tk.StringVar(value="0 matches")
         self._conc_hit_spans = {}
+        self._conc_last_sig = None  # (query, ci, regex, ctx, len, hash) of the last search
+
+        # snapshot of txt_input's contents, dropped on <<Modified>>
+        self._input_text_cache = None
 
         # grid clipboard (for copy/cut/paste)
         self._grid_clipboard = None
@@ -829,8 +852,13 @@ VOC vocative
             return
 
         self.blocks = []
-        self._row_index_map = {}
-        self._sep_rows = set()
+        self._row_bidx = array("i")
+        self._row_ridx = array("i")
+        self._sep_flags = bytearray()
+        self._sep_rows_sorted = []
+        self._first_real_r = None
+        self._renum_dirty = None
+        self._renum_g_at = []
         self._extra_headers = []
         self.cfg = DEFAULTS.copy()
 
@@ -1064,11 +1092,15 @@ VOC vocative
         self.txt_input.bind("<FocusIn>", lambda e: setattr(self, "_active_area", "text"))
         self.txt_input.bind("<Button-1>", lambda e: setattr(self, "_active_area", "text"))
 
+        # Invalidate text-derived caches whenever the input is edited
+        self.txt_input.bind("<<Modified>>", self._on_input_modified)
+
         # OUTPUT grid
         tbl_frame = tk.Frame(right, bg=DARK_BG)
         tbl_frame.pack(fill="both", expand=True)
 
         self.sheet = None
+        self._get_sel = self._get_sel_cells = None
         if tksheet is None:
             warn = tk.Label(
                 tbl_frame,
@@ -1092,6 +1124,9 @@ VOC vocative
                 show_header=True,
                 show_table=True,
             )
+            # selection getters, bound once for the keyboard paths (_get_rc)
+            self._get_sel = self.sheet.get_currently_selected
+            self._get_sel_cells = self.sheet.get_selected_cells
 
             self.sheet.enable_bindings((
                 "single_select",
@@ -1202,18 +1237,9 @@ VOC vocative
             return "break"
         # start editing the currently selected cell
         self._ensure_sheet_focus()
-        try:
-            sel = self.sheet.get_currently_selected()
-            r = getattr(sel, "row", None) if sel is not None else None
-            c = getattr(sel, "column", None) if sel is not None else None
-            if r is None or c is None:
-                cells = self.sheet.get_selected_cells()
-                if cells:
-                    r, c = list(cells)[0]
-        except Exception:
-            r = c = None
+        r, c = self._get_rc()
 
-        if r is None or c is None or r in self._sep_rows:
+        if r is None or c is None or self._is_sep_row(r):
             # fall back to first real row, prefer Label column
             r, c = self._ensure_valid_selection(prefer_col=2)
         if r is None or c is None:
@@ -1467,8 +1493,8 @@ VOC vocative
 
         out = []
         # Iterate
-        for vis_r, bidx, ridx, row in annotation_model.iter_visible_rows(
-            self.blocks, self._row_index_map, self._sep_rows
+        for vis_r, bidx, ridx, row in annotation_model.iter_visible_rows_from_arrays(
+            self.blocks, self._row_bidx, self._row_ridx, self._sep_flags
         ):
             vals = [
                 row.get('idx', ''),
@@ -1561,6 +1587,12 @@ VOC vocative
             pass
 
         def _on_close():
+            # drop the references too, so later edits don't target a dead widget
+            if self._full_sheet is sh:
+                self._full_sheet = None
+                self._full_win = None
+            if getattr(self, "_active_sheet", None) is sh:
+                self._active_sheet = self.sheet
             try:
                 win.destroy()
             except Exception:
@@ -1621,7 +1653,8 @@ VOC vocative
 
         btns = ttk.Frame(outer, style='Dark.TFrame')
         btns.pack(anchor="w", pady=(0, 6))
-        ttk.Button(btns, text="Refresh", style='Dark.TButton', command=lambda: None).pack(side="left")
+        refresh_btn = ttk.Button(btns, text="Refresh", style='Dark.TButton')
+        refresh_btn.pack(side="left")
 
         # table
         cols = ("token", "freq", "labels")
@@ -1677,16 +1710,17 @@ VOC vocative
             allowed = {k for k, v in self._freq_label_vars.items() if v.get()}
             freq, by_label, total = self._compute_word_frequencies(allowed_labels=allowed)
             items = sorted(freq.items(), key=lambda x: (-x[1], x[0]))
-            for tok, cnt in items:
-                lbls = by_label.get(tok, {})
-                lbl_str = ", ".join(f"{k}:{v}" for k, v in sorted(lbls.items()))
-                tree.insert("", "end", values=(tok, cnt, lbl_str))
+            # keep the rows in Python so CSV export doesn't read them back from Tk
+            self._freq_items = [
+                (tok, cnt, ", ".join(f"{k}:{v}" for k, v in sorted(by_label.get(tok, {}).items())))
+                for tok, cnt in items
+            ]
+            for row in self._freq_items:
+                tree.insert("", "end", values=row)
             info.configure(text=f"Total tokens counted: {total}")
 
         # wire Refresh button
-        for child in btns.winfo_children():
-            if isinstance(child, ttk.Button) and child.cget("text") == "Refresh":
-                child.configure(command=_run_freq)
+        refresh_btn.configure(command=_run_freq)
 
         _run_freq()
 
@@ -1704,8 +1738,7 @@ VOC vocative
                 with open(path, "w", encoding="utf-8", newline="") as f:
                     w = csv.writer(f)
                     w.writerow(["Token", "Frequency", "LabelBreakdown"])
-                    for iid in tree.get_children():
-                        w.writerow(tree.item(iid, "values"))
+                    w.writerows(self._freq_items)
             except Exception as e:
                 messagebox.showerror("Export error", str(e))
 
@@ -1718,6 +1751,7 @@ VOC vocative
                 pass
             finally:
                 self._freq_win = None
+                self._freq_items = []
 
         win.protocol("WM_DELETE_WINDOW", _on_close)
         self._freq_win = win
@@ -1766,12 +1800,12 @@ VOC vocative
             except Exception:
                 pass
 
-        if r is None or r in self._sep_rows:
+        if r is None or self._is_sep_row(r):
             messagebox.showwarning("Show Sentence", "Please select a valid token row.")
             return
 
         # Map visible row to model row
-        bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+        bidx, ridx = self._rmap(r)
         if bidx is None:
             messagebox.showwarning("Show Sentence", "Invalid selection.")
             return
@@ -1790,7 +1824,7 @@ VOC vocative
 
         # Get full input text
         try:
-            text = self.txt_input.get("1.0", "end-1c")
+            text = self._cached_input_text()
         except Exception:
             text = ""
         if not text:
@@ -2015,6 +2049,22 @@ VOC vocative
         except Exception:
             pass
 
+    def _on_input_modified(self, event=None):
+        """Drop caches derived from the input text. Tk only fires <<Modified>>
+        when the flag flips, so it is reset here to catch the next edit."""
+        self._input_text_cache = None
+        self._conc_last_sig = None
+        try:
+            self.txt_input.edit_modified(False)
+        except Exception:
+            pass
+
+    def _cached_input_text(self):
+        """Input text as a Python string, fetched from Tk once per edit."""
+        if self._input_text_cache is None:
+            self._input_text_cache = self.txt_input.get("1.0", "end-1c")
+        return self._input_text_cache
+
     def _conc_clear(self):
         if self._conc_tree is None:
             return
@@ -2024,6 +2074,7 @@ VOC vocative
         except Exception:
             pass
         self._conc_count_var.set("0 matches")
+        self._conc_last_sig = None
         if not hasattr(self, "_conc_hit_spans"):
             self._conc_hit_spans = {}
         self._conc_hit_spans = {}
@@ -2048,7 +2099,7 @@ VOC vocative
         ctx = max(1, min(ctx, 500))
 
         try:
-            text = self.txt_input.get("1.0", "end-1c")
+            text = self._cached_input_text()
         except Exception:
             text = ""
 
@@ -2056,9 +2107,21 @@ VOC vocative
             self._conc_clear()
             return
 
-        flags = re.IGNORECASE if self._conc_ci_var.get() else 0
+        # Same query over unchanged text (e.g. a repeated Return): keep the hits
+        ci = bool(self._conc_ci_var.get())
+        use_regex = bool(self._conc_regex_var.get())
+        sig = (query, ci, use_regex, ctx, len(text),
+               hash(text) if len(text) < 1_000_000 else id(text))
+        if sig == self._conc_last_sig and self._conc_tree.get_children():
+            try:
+                self._conc_tree.focus_set()
+            except Exception:
+                pass
+            return
+
+        flags = re.IGNORECASE if ci else 0
         try:
-            pat = re.compile(query if self._conc_regex_var.get() else re.escape(query), flags)
+            pat = re.compile(query if use_regex else re.escape(query), flags)
         except Exception as e:
             messagebox.showerror("Regex error", str(e))
             return
@@ -2088,6 +2151,7 @@ VOC vocative
                 break
 
         self._conc_count_var.set(f"{n} matches" + (" (truncated)" if n >= max_hits else ""))
+        self._conc_last_sig = sig
 
         try:
             kids = list(self._conc_tree.get_children())
@@ -2171,7 +2235,7 @@ VOC vocative
             self.bell()
             return
         c = 2  # force Label column
-        bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+        bidx, ridx = self._rmap(r)
         if bidx is None:
             self.bell()
             return
@@ -2205,8 +2269,28 @@ VOC vocative
         self.cfg[key] = bool(val)
 
     # Dynamic columns
+    @property
+    def _extra_headers(self):
+        return self._extra_headers_list
+
+    @_extra_headers.setter
+    def _extra_headers(self, value):
+        # every change to the extra columns goes through here, so the
+        # header cache can't go stale
+        self._extra_headers_list = value
+        self._headers_cache = None
+
     def _all_headers(self):
-        return list(self._core_headers) + list(self._extra_headers)
+        return list(self._cached_headers())
+
+    def _cached_headers(self):
+        """Shared header list for hot loops; don't mutate it or hand it to tksheet."""
+        hdrs = self._headers_cache
+        if hdrs is None:
+            hdrs = self._headers_cache = list(self._core_headers) + list(self._extra_headers)
+            # per-column "user-added?" flags, rebuilt together with the cache
+            self._is_extra_col = [c > self._COL_GLOSS for c in range(len(hdrs))]
+        return hdrs
 
     def _add_new_column(self, col_name: str):
         name = (col_name or "").strip()
@@ -2217,7 +2301,7 @@ VOC vocative
         if name in set(self._all_headers()):
             return False, "Column already exists."
 
-        self._extra_headers.append(name)
+        self._extra_headers = self._extra_headers + [name]
 
         # ensure model rows have the new key
         for blk in getattr(self, 'blocks', []) or []:
@@ -2327,13 +2411,13 @@ VOC vocative
         except TypeError:
             # older tksheet versions
             data = self.sheet.get_sheet_data()
+        ncol = len(self._cached_headers())
         rows = []
         for r in (data or []):
             if r is None:
-                rows.append(["" for _ in self._all_headers()])
+                rows.append(["" for _ in range(ncol)])
                 continue
             rr = list(r)
-            ncol = len(self._all_headers())
             while len(rr) < ncol:
                 rr.append("")
             rr = rr[:ncol]
@@ -2357,7 +2441,7 @@ VOC vocative
         return self._all_headers()
 
     def _sheet_rows_to_txt(self, rows):
-        return annotation_model.sheet_rows_to_txt(rows, self._all_headers())
+        return annotation_model.sheet_rows_to_txt(rows, self._cached_headers())
 
     def save_output(self):
         if not getattr(self, 'blocks', None):
@@ -2410,7 +2494,7 @@ VOC vocative
                             rr.append(str(r.get(h, '')))
                         sheet_rows.append(rr)
                     if bi < len(getattr(self, 'blocks', [])) - 1:
-                        sheet_rows.append(["" for _ in self._all_headers()])  # block separator
+                        sheet_rows.append(["" for _ in self._cached_headers()])  # block separator
 
             with open(path, "w", encoding="utf-8", newline="") as cf:
                 w = csv.writer(cf)
@@ -2493,52 +2577,80 @@ VOC vocative
         if not data:
             return
 
-        hdrs = self._all_headers()
+        hdrs = self._cached_headers()
+
+        # bind hot lookups once; the loop below runs once per pasted cell
+        ncol = len(hdrs)
+        col_is_extra = self._is_extra_col
+        COL_ITEM, COL_LABEL, COL_GLOSS = self._COL_ITEM, self._COL_LABEL, self._COL_GLOSS
+        blocks = self.blocks
+        rmap = self._rmap  # (None, None) on separator rows
+        is_locked = annotation_model.is_matrixembed_locked
+        mark_dirty = self._mark_renum_dirty
+        is_meta = annotation_model.is_meta_row_token
+        pending = []  # accepted (r, c, val) writes, applied to the sheet after the loop
 
         for dr, row_vals in enumerate(data):
             r = r0 + dr
-            if r in self._sep_rows:
-                continue
-            bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+            bidx, ridx = rmap(r)
             if bidx is None:
                 continue
+            row = blocks[bidx][ridx]
 
             for dc, val in enumerate(row_vals):
                 c = c0 + dc
-                if c == 0 or c >= len(hdrs):
+                if c == 0 or c >= ncol:
                     continue
 
-                # Matrix/Embed constraint only for Label column
-                if hdrs[c] == "Label":
-                    tok = self.blocks[bidx][ridx].get('token')
-                    if annotation_model.is_matrixembed_locked(tok, val):
+                # update model (Matrix/Embed constraint only for Label column)
+                if c == COL_LABEL:
+                    if is_locked(row.get('token'), val):
                         continue
+                    row['label'] = val
+                elif c == COL_ITEM:
+                    # ids only move when a row turns into / out of a meta row
+                    if is_meta(row.get('token', '')) != is_meta(val):
+                        mark_dirty(bidx)
+                    row['token'] = val
+                elif c == COL_GLOSS:
+                    row['gloss'] = val
+                elif col_is_extra[c]:
+                    row[hdrs[c]] = val
+
+                pending.append((r, c, val))
 
-                # update model
-                if hdrs[c] == "Item":
-                    self.blocks[bidx][ridx]['token'] = val
-                elif hdrs[c] == "Label":
-                    self.blocks[bidx][ridx]['label'] = val
-                elif hdrs[c] == "Gloss":
-                    self.blocks[bidx][ridx]['gloss'] = val
-                else:
-                    self.blocks[bidx][ridx][hdrs[c]] = val
-
-                # update UI
-                try:
-                    self.sheet.set_cell_data(r, c, val)
-                except Exception:
-                    pass
+        # update UI
+        self._write_cells(self.sheet, pending)
 
         # renumber tokens if Item column affected
-        self._renumber_tokens()
-        self._refresh_sheet_idx_column()
-
-        try:
-            if hasattr(self.sheet, "refresh"):
-                self.sheet.refresh()
-        except Exception:
-            pass
+        if self._renum_dirty is not None:
+            self._renumber_tokens()
+            self._refresh_sheet_idx_column()
+        self._schedule_refresh()
+
+    def _write_cells(self, sh, writes):
+        """Apply (r, c, value) writes to a sheet without redrawing. Writes that
+        exactly fill a rectangle go out as a single set_data call."""
+        if not writes:
+            return
+        rs = {r for r, _, _ in writes}
+        cs = {c for _, c, _ in writes}
+        r_min, c_min = min(rs), min(cs)
+        nr, nc = max(rs) - r_min + 1, max(cs) - c_min + 1
+        if len(rs) == nr and len(cs) == nc and len(writes) == nr * nc:
+            grid = [[""] * nc for _ in range(nr)]
+            for r, c, v in writes:
+                grid[r - r_min][c - c_min] = v
+            try:
+                sh.set_data((r_min, c_min), data=grid, redraw=False)
+                return
+            except Exception:
+                pass
+        for r, c, v in writes:
+            try:
+                sh.set_cell_data(r, c, v, redraw=False)
+            except Exception:
+                pass
 
     def clear_selected_cells(self):
         if self.sheet is None:
@@ -2554,121 +2666,162 @@ VOC vocative
         self._ensure_sheet_focus()
         self._cancel_edit_if_any()
 
-        hdrs = self._all_headers()
+        hdrs = self._cached_headers()
+        ncol = len(hdrs)
+        col_is_extra = self._is_extra_col
+        COL_ITEM, COL_LABEL, COL_GLOSS = self._COL_ITEM, self._COL_LABEL, self._COL_GLOSS
+        blocks = self.blocks
+        set_cell = self.sheet.set_cell_data
+        rmap = self._rmap  # (None, None) on separator rows
+        is_meta = annotation_model.is_meta_row_token
+
         for r, c in cells:
-            if r in self._sep_rows:
-                continue
             # idx column is not clearable
             if c == 0:
                 continue
-            bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+            bidx, ridx = rmap(r)
             if bidx is None:
                 continue
 
             # update model
-            if c == 1:
-                self.blocks[bidx][ridx]['token'] = ""
-                self._renumber_tokens()
-            elif c == 2:
-                self.blocks[bidx][ridx]['label'] = ""
-            elif c == 3:
-                self.blocks[bidx][ridx]['gloss'] = ""
-            else:
-                if 0 <= c < len(hdrs):
-                    key = hdrs[c]
-                    if key not in ("Token", "Item", "Label", "Gloss"):
-                        self.blocks[bidx][ridx][key] = ""
+            if c == COL_ITEM:
+                # a cleared Item is a blank (meta) row; ids move only if it wasn't one
+                if not is_meta(blocks[bidx][ridx].get('token', '')):
+                    self._mark_renum_dirty(bidx)
+                blocks[bidx][ridx]['token'] = ""
+            elif c == COL_LABEL:
+                blocks[bidx][ridx]['label'] = ""
+            elif c == COL_GLOSS:
+                blocks[bidx][ridx]['gloss'] = ""
+            elif 0 <= c < ncol and col_is_extra[c]:
+                blocks[bidx][ridx][hdrs[c]] = ""
 
             # update UI cell
             try:
-                self.sheet.set_cell_data(r, c, "")
+                set_cell(r, c, "")
             except Exception:
                 pass
 
-        # refresh idx column if tokens changed
-        self._refresh_sheet_idx_column()
-        try:
-            if hasattr(self.sheet, "refresh"):
-                self.sheet.refresh()
-        except Exception:
-            pass
+        # renumber + refresh idx column once, and only if numbering changed
+        if self._renum_dirty is not None:
+            self._renumber_tokens()
+            self._refresh_sheet_idx_column()
+        self._schedule_refresh()
+
+    def _live_sheets(self):
+        """Main sheet plus the full edit sheet, skipping any that is gone."""
+        out = [self.sheet] if self.sheet is not None else []
+        fs = self._full_sheet
+        if fs is not None:
+            try:
+                alive = fs.winfo_exists()
+            except Exception:
+                alive = False
+            if alive:
+                out.append(fs)
+            else:
+                self._full_sheet = None
+        return out
 
     def insert_row_before(self):
         if self.sheet is None:
             return
-        try:
-            sel = self.sheet.get_currently_selected()
-            r = getattr(sel, 'row', None)
-        except Exception:
-            r = None
-        if r is None or r in self._sep_rows:
+        r, _ = self._get_rc()
+        if r is None or self._is_sep_row(r):
             self.bell()
             return
 
-        bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+        bidx, ridx = self._rmap(r)
         if bidx is None:
             self.bell()
             return
 
         # create empty row respecting dynamic columns
-        new_row = {"idx": "", "token": "", "label": "", "gloss": ""}
-        for h in self._extra_headers:
-            new_row[h] = ""
+        new_row = {"idx": "", "token": "", "label": "", "gloss": "", **dict.fromkeys(self._extra_headers, "")}
 
+        # a blank row is a meta row, so existing token ids don't move
         self.blocks[bidx].insert(ridx, new_row)
 
-        # renumber tokens
-        self._renumber_tokens()
+        # patch the grid in place; a full rebuild is the fallback
+        new_vals = ["", "", "", ""] + ["" for _ in self._extra_headers]
+        try:
+            for sh in self._live_sheets():
+                # no undo in the app, so keep tksheet from snapshotting rows
+                sh.insert_row(new_vals, idx=r, undo=False, redraw=False)
+        except Exception:
+            self._rebuild_grid_from_model(select_row=r, select_col=2)
+            return
 
-        # rebuild grid directly from the model so blank row is preserved
-        self._rebuild_grid_from_model(select_row=r, select_col=2)
+        self._shift_grid_rows(r, +1, bidx, ridx)
+        self._select_on_all_sheets(r, 2)
+        self._schedule_refresh()
 
     def remove_selected_row(self):
         if self.sheet is None:
             return
-        try:
-            sel = self.sheet.get_currently_selected()
-            r = getattr(sel, 'row', None)
-        except Exception:
-            r = None
-        if r is None or r in self._sep_rows:
+        r, _ = self._get_rc()
+        if r is None or self._is_sep_row(r):
             self.bell()
             return
 
-        bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+        bidx, ridx = self._rmap(r)
         if bidx is None:
             self.bell()
             return
 
         try:
-            del self.blocks[bidx][ridx]
+            removed = self.blocks[bidx].pop(ridx)
         except Exception:
             self.bell()
             return
 
-        # remove empty blocks if needed
+        # remove empty blocks if needed; its separator row has to go too,
+        # so that case takes the full rebuild (and renumber, as block
+        # indices shift)
         if not self.blocks[bidx]:
             del self.blocks[bidx]
+            self._mark_renum_dirty(bidx)
+            self._renumber_tokens()
+            self._rebuild_grid_from_model(select_row=None, select_col=2)
+            return
 
-        self._renumber_tokens()
-        self._rebuild_grid_from_model(select_row=None, select_col=2)
+        # removing a meta row leaves every token id where it was
+        renumber = not self._is_meta_row_token(removed.get('token', ''))
+        if renumber:
+            self._mark_renum_dirty(bidx)
+            self._renumber_tokens()
+
+        try:
+            for sh in self._live_sheets():
+                sh.delete_row(r, undo=False, redraw=False)
+        except Exception:
+            self._rebuild_grid_from_model(select_row=None, select_col=2)
+            return
+
+        self._shift_grid_rows(r, -1, bidx)
+        if renumber:
+            self._refresh_sheet_idx_column()
+        self._select_first_cell()
+        self._schedule_refresh()
 
     # Focus & Edit utils
 
     def _set_cell_on_all_sheets(self, r: int, c: int, value: str):
         """Set a cell value in the main sheet and the full edit sheet (if open)."""
-        for sh in (getattr(self, 'sheet', None), getattr(self, '_full_sheet', None)):
-            if sh is None:
-                continue
+        sh = getattr(self, 'sheet', None)
+        if sh is not None:
             try:
-                sh.set_cell_data(r, c, value)
+                sh.set_cell_data(r, c, value, redraw=False)
             except Exception:
                 pass
+        fs = getattr(self, '_full_sheet', None)
+        if fs is not None:
             try:
-                if hasattr(sh, 'refresh'):
-                    sh.refresh()
+                fs.set_cell_data(r, c, value, redraw=False)
             except Exception:
                 pass
+        self._schedule_refresh()
+
     def _ensure_sheet_focus(self):
         if self.sheet is None:
             return
@@ -2694,22 +2847,28 @@ VOC vocative
                 except Exception:
                     pass
 
+    def _get_rc(self):
+        """(row, column) of the current selection on the main sheet, or (None, None)."""
+        try:
+            sel = self._get_sel()
+            # tksheet returns () when nothing is selected
+            if sel:
+                r, c = getattr(sel, "row", None), getattr(sel, "column", None)
+                if r is not None and c is not None:
+                    return r, c
+            for rc in self._get_sel_cells() or ():
+                return rc
+        except Exception:
+            pass
+        return None, None
+
     def _ensure_valid_selection(self, prefer_col=2):
         """Geçerli, ayıraç olmayan bir seçim olsun. Yoksa ilk gerçek satırın prefer_col'unu seç."""
         if self.sheet is None:
             return None, None
-        try:
-            sel = self.sheet.get_currently_selected()
-            r = getattr(sel, "row", None) if sel is not None else None
-            c = getattr(sel, "column", None) if sel is not None else None
-            if r is None or c is None:
-                cells = self.sheet.get_selected_cells()
-                if cells:
-                    r, c = list(cells)[0]
-        except Exception:
-            r = c = None
+        r, c = self._get_rc()
 
-        if r is None or c is None or r in self._sep_rows:
+        if r is None or c is None or self._is_sep_row(r):
             fr = self._first_real_row()
             if fr is None:
                 return None, None
@@ -2741,7 +2900,7 @@ VOC vocative
             self.bell()
             return
 
-        bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
+        bidx, ridx = self._rmap(r)
         if bidx is None:
             self.bell()
             return
@@ -2759,27 +2918,27 @@ VOC vocative
                 return
             self.blocks[bidx][ridx]['label'] = new_value
         elif c == 1:
-            # Item
+            # Item; ids only move if the row's meta status flips
+            was_meta = self._is_meta_row_token(self.blocks[bidx][ridx].get('token', ''))
             self.blocks[bidx][ridx]['token'] = new_value
-            self._renumber_tokens()
-            self._refresh_sheet_idx_column()
+            if was_meta != self._is_meta_row_token(new_value):
+                self._mark_renum_dirty(bidx)
+                self._renumber_tokens()
+                self._refresh_sheet_idx_column()
         elif c == 3:
             # Gloss
             self.blocks[bidx][ridx]['gloss'] = new_value
         else:
             # Extra user-defined columns
-            hdrs = self._all_headers()
-            if 0 <= c < len(hdrs):
-                key = hdrs[c]
-                if key not in ("Token", "Item", "Label", "Gloss"):
-                    self.blocks[bidx][ridx][key] = new_value
+            hdrs = self._cached_headers()
+            if 0 <= c < len(hdrs) and self._is_extra_col[c]:
+                self.blocks[bidx][ridx][hdrs[c]] = new_value
 
         try:
             self.sheet.set_cell_data(r, c, new_value)
-            if hasattr(self.sheet, "refresh"):
-                self.sheet.refresh()
         except Exception:
             pass
+        self._schedule_refresh()
 
         #
         self._ensure_sheet_focus()
@@ -2790,35 +2949,40 @@ VOC vocative
         if not self.cfg.get('FEATURE_EMBEDDED_LANGUAGE', False):
             return text
         want_matrix = self.cfg.get('FEATURE_MATRIX_LANGUAGE', False)
-        blocks = text.split("\n\n")
+        label_re = _LABEL_RE
+        matrix_re = _MATRIX_RE
         new_blocks = []
-        for b in blocks:
+        for b in text.split("\n\n"):
             if not b.strip():
                 new_blocks.append(b)
                 continue
             lines = b.splitlines()
-            has_embed = any(ln.startswith("EmbedLang") for ln in lines)
-            has_matrix = any(ln.startswith("MatrixLang") for ln in lines)
-            if want_matrix and has_embed and not has_matrix:
+            if want_matrix:
+                # one pass: note EmbedLang, tally TR/EN labels, and stop as
+                # soon as a MatrixLang line shows nothing needs adding
+                has_embed = False
                 tr = en = 0
                 for ln in lines:
-                    if "\t" in ln and not (ln.startswith("MatrixLang") or ln.startswith("EmbedLang")):
-                        try:
-                            parts = ln.split("\t")
-                            if len(parts) >= 2:
-                                lab = parts[-1].strip()
-                                if lab == 'TR': tr += 1
-                                elif lab == 'EN': en += 1
-                        except Exception:
-                            pass
+                    m = matrix_re.match(ln)
+                    if m is not None:
+                        if m.group(1) == "MatrixLang":
+                            break
+                        has_embed = True
+                    if m is None and "\t" in ln:
+                        lab = ln.rsplit("\t", 1)[1].strip()
                     else:
-                        m = re.match(r"^(\S+)\s+(TR|EN|MIXED|UID|NE|OTHER|LANG3)\s*$", ln)
-                        if m:
-                            lab = m.group(2)
-                            if lab == 'TR': tr += 1
-                            elif lab == 'EN': en += 1
-                mx = 'TR' if tr >= en else 'EN'
-                lines.append(f"MatrixLang\t{mx}")
+                        lm = label_re.match(ln)
+                        if lm is None:
+                            continue
+                        lab = lm.group(2)
+                    if lab == "TR":
+                        tr += 1
+                    elif lab == "EN":
+                        en += 1
+                else:
+                    if has_embed:
+                        mx = 'TR' if tr >= en else 'EN'
+                        lines.append(f"MatrixLang\t{mx}")
             new_blocks.append("\n".join(lines))
         return "\n\n".join(new_blocks)
 
@@ -2826,51 +2990,28 @@ VOC vocative
     def _populate_table(self, text):
         """Annotate çıktısını bloklara ayır, modelini kur, grid'e doldur (global idx ile)."""
         self.blocks = []
-        self._row_index_map = {}
-        self._sep_rows = set()
+        self._row_bidx = array("i")
+        self._row_ridx = array("i")
+        self._sep_flags = bytearray()
+        self._sep_rows_sorted = []
+        self._first_real_r = None
+        self._renum_dirty = None
+        self._renum_g_at = []
         if self.sheet is None:
             return
 
         # 1) blocks
-        raw_blocks = []
-        for b in text.split("\n\n"):
-            rows = []
-            for ln in b.splitlines():
-                ln = ln.strip()
-                if not ln:
-                    continue
-
-                parts = ln.split("\t")
-                token = label = None
-
-                if len(parts) >= 2:
-                    if len(parts) == 2:
-                        token, label = parts[0].strip(), parts[1].strip()
-                    else:
-                        token, label = parts[1].strip(), parts[2].strip()
-                else:
-                    m = re.match(r"^(\S+)\s+(TR|EN|MIXED|UID|NE|OTHER|LANG3)\s*$", ln)
-                    if m:
-                        token, label = m.group(1), m.group(2)
-
-                if token is None:
-                    continue
-
-                rr = {"idx": 0, "token": token, "label": label, "gloss": ""}
-                for h in self._extra_headers:
-                    rr.setdefault(h, "")
-                rows.append(rr)
-            raw_blocks.append(rows)
-
-        self.blocks = raw_blocks
+        # rows stay plain dicts (project files and annotation_model rely on that)
+        self.blocks = list(annotation_model.iter_annotated_blocks(text, self._extra_headers))
 
         # 2) Global
         self._renumber_tokens()
 
         # 3) Grid
-        data, self._row_index_map, self._sep_rows = annotation_model.build_grid_view(
+        data, self._row_bidx, self._row_ridx, sep_rows = annotation_model.build_grid_arrays(
             self.blocks, self._extra_headers, skip_separator_after_empty_block=True
         )
+        self._index_sep_rows(len(data), sep_rows)
 
         try:
             self.sheet.headers(self._all_headers())
@@ -2878,13 +3019,80 @@ VOC vocative
             pass
         self.sheet.set_sheet_data(data)
 
-        if self._sep_rows:
+        if self._sep_rows_sorted:
             try:
-                self.sheet.set_row_colors(rows=list(self._sep_rows), bg="#151515", fg="#666666")
+                self.sheet.set_row_colors(rows=list(self._sep_rows_sorted), bg="#151515", fg="#666666")
             except Exception:
                 pass
         self._select_first_cell()
 
+    def _rmap(self, r):
+        """Visible row -> (bidx, ridx); (None, None) for separators/unmapped rows."""
+        row_bidx = self._row_bidx
+        if r is None or not 0 <= r < len(row_bidx):
+            return None, None
+        bidx = row_bidx[r]
+        if bidx < 0:
+            return None, None
+        return bidx, self._row_ridx[r]
+
+    def _index_sep_rows(self, nrows, sep_rows):
+        """Index separator rows as a flag vector by visible row plus a sorted list."""
+        flags = bytearray(nrows)
+        for r in sep_rows:
+            flags[r] = 1
+        self._sep_flags = flags
+        self._sep_rows_sorted = sorted(sep_rows)
+        self._update_first_real_row()
+
+    def _update_first_real_row(self):
+        r = self._sep_flags.find(0)
+        self._first_real_r = r if r >= 0 else None
+
+    def _shift_grid_rows(self, at_row, delta, bidx, ridx=-1):
+        """Keep the row map and separator index in step with a one-row grid insert/delete."""
+        annotation_model.shift_grid_arrays(
+            self._row_bidx, self._row_ridx, None, at_row, delta, bidx, ridx
+        )
+        if delta > 0:
+            self._sep_flags.insert(at_row, 0)
+        else:
+            del self._sep_flags[at_row]
+        seps = self._sep_rows_sorted
+        for i in range(bisect_left(seps, at_row), len(seps)):
+            seps[i] += delta
+        self._update_first_real_row()
+
+    def _next_real_row(self, n, step, total):
+        """First non-separator row from n onward in direction step (+1/-1),
+        or None if the walk leaves the grid."""
+        seps = self._sep_rows_sorted
+        i = bisect_left(seps, n)
+        while 0 <= n < total:
+            # seps is sorted and unique, so a run of adjacent separators
+            # sits at adjacent indices
+            if not (0 <= i < len(seps)) or seps[i] != n:
+                return n
+            n += step
+            i += step
+        return None
+
+    def _select_on_all_sheets(self, r, c):
+        for sh in (self.sheet, self._full_sheet):
+            if sh is None:
+                continue
+            try:
+                sh.select_cell(r, c)
+                sh.see(r, c)
+            except Exception:
+                pass
+        self._last_pos = (r, c)
+
+    def _is_sep_row(self, r):
+        # bounds-checked: for rows taken from a selection that may be stale
+        flags = self._sep_flags
+        return 0 <= r < len(flags) and flags[r] == 1
+
     def _reconstruct_text_from_blocks(self):
         return annotation_model.reconstruct_text_from_blocks(self.blocks, self._extra_headers)
 
@@ -2892,7 +3100,15 @@ VOC vocative
         return annotation_model.is_meta_row_token(tok)
 
     def _renumber_tokens(self):
-        annotation_model.renumber_tokens(self.blocks)
+        """Renumber from the earliest block marked dirty, or from scratch."""
+        start = self._renum_dirty
+        self._renum_dirty = None
+        annotation_model.renumber_tokens_from(self.blocks, self._renum_g_at, start or 0)
+
+    def _mark_renum_dirty(self, bidx):
+        d = self._renum_dirty
+        if d is None or bidx < d:
+            self._renum_dirty = bidx
 
     def _refresh_sheet_idx_column(self):
         """Modeldeki idx değerlerini grid'in 0. kolonuna geri bas.
@@ -2901,29 +3117,51 @@ VOC vocative
         if self.sheet is None and self._full_sheet is None:
             return
         try:
-            for vis_r, mapping in self._row_index_map.items():
-                if vis_r in self._sep_rows:
-                    continue
-                bidx, ridx = mapping
-                if bidx is None:
+            # build the whole column once, then write it per sheet in one call
+            blocks = self.blocks
+            row_ridx = self._row_ridx
+            col0 = []
+            for vis_r, bidx in enumerate(self._row_bidx):
+                if bidx < 0:
+                    col0.append("")
                     continue
-
-                idxv = self.blocks[bidx][ridx].get("idx", "")
-                idxs = "" if idxv is None else str(idxv)
-
-                for sh in (self.sheet, self._full_sheet):
-                    if sh is None:
-                        continue
-                    try:
-                        sh.set_cell_data(vis_r, 0, idxs)
-                    except Exception:
-                        pass
+                idxv = blocks[bidx][row_ridx[vis_r]].get("idx", "")
+                col0.append("" if idxv is None else str(idxv))
 
             for sh in (self.sheet, self._full_sheet):
-                if sh is not None and hasattr(sh, "refresh"):
-                    sh.refresh()
+                if sh is None:
+                    continue
+                try:
+                    sh.set_column_data(0, col0, add_rows=False, redraw=False)
+                except Exception:
+                    for vis_r, idxs in enumerate(col0):
+                        try:
+                            sh.set_cell_data(vis_r, 0, idxs, redraw=False)
+                        except Exception:
+                            pass
         except Exception:
             pass
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        """Queue one refresh of both sheets for when the event loop goes idle,
+        so a burst of cell writes costs a single redraw."""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        try:
+            self.after_idle(self._do_refresh)
+        except Exception:
+            self._do_refresh()
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        for sh in (self.sheet, self._full_sheet):
+            if sh is not None and hasattr(sh, "refresh"):
+                try:
+                    sh.refresh()
+                except Exception:
+                    pass
 
     def _rebuild_grid_from_model(self, select_row=None, select_col=2):
         """Rebuild grid UI from self.blocks without re-parsing text.
@@ -2932,9 +3170,10 @@ VOC vocative
         if self.sheet is None and self._full_sheet is None:
             return
 
-        data, self._row_index_map, self._sep_rows = annotation_model.build_grid_view(
+        data, self._row_bidx, self._row_ridx, sep_rows = annotation_model.build_grid_arrays(
             self.blocks, self._extra_headers, skip_separator_after_empty_block=False
         )
+        self._index_sep_rows(len(data), sep_rows)
 
         for sh in (self.sheet, self._full_sheet):
             if sh is None:
@@ -2948,12 +3187,12 @@ VOC vocative
             except Exception:
                 continue
 
-        if self._sep_rows:
+        if self._sep_rows_sorted:
             for sh in (self.sheet, self._full_sheet):
                 if sh is None:
                     continue
                 try:
-                    sh.set_row_colors(rows=list(self._sep_rows), bg="#151515", fg="#666666")
+                    sh.set_row_colors(rows=list(self._sep_rows_sorted), bg="#151515", fg="#666666")
                 except Exception:
                     pass
 
@@ -2977,61 +3216,71 @@ VOC vocative
             if sheet is None:
                 return
             r, c = event.row, event.column
-            if r in self._sep_rows:
-                return
-            bidx, ridx = annotation_model.resolve_row(self._row_index_map, self._sep_rows, r)
-            if bidx is None:
+            # the edited row comes from the sheet, so it is always in range;
+            # separator rows map to -1
+            bidx = self._row_bidx[r]
+            if bidx < 0:
                 return
+            ridx = self._row_ridx[r]
 
             # idx
             if c == 0:
                 ov = self.blocks[bidx][ridx].get("idx", "")
                 ov = "" if ov is None else str(ov)
-                sheet.set_cell_data(r, 0, ov)
-                if hasattr(sheet, "refresh"):
-                    sheet.refresh()
+                sheet.set_cell_data(r, 0, ov, redraw=False)
+                self._schedule_refresh()
                 self.bell()
                 return
 
             nv = sheet.get_cell_data(r, c)
 
+            if c == 1:
+                key = 'token'
+            elif c == 2:
+                key = 'label'
+            elif c == 3:
+                key = 'gloss'
+            else:
+                hdrs = self._cached_headers()
+                if not (0 <= c < len(hdrs) and self._is_extra_col[c]):
+                    return
+                key = hdrs[c]
+
+            row = self.blocks[bidx][ridx]
+            ov = row.get(key, '')
+            # Enter without an edit: nothing to write, renumber or propagate
+            if nv == ov:
+                return
+
             if c == 2:
                 # Label
-                if annotation_model.is_matrixembed_locked(self.blocks[bidx][ridx].get('token'), nv):
-                    ov = self.blocks[bidx][ridx].get('label', '')
-                    sheet.set_cell_data(r, 2, ov)
-                    if hasattr(sheet, "refresh"):
-                        sheet.refresh()
+                if annotation_model.is_matrixembed_locked(row.get('token'), nv):
+                    sheet.set_cell_data(r, 2, ov, redraw=False)
+                    self._schedule_refresh()
                     self.bell()
                     return
-                self.blocks[bidx][ridx]['label'] = nv
+                row['label'] = nv
             elif c == 1:
                 # Item
-                self.blocks[bidx][ridx]['token'] = nv
-                # Token may have changed into (MatrixLang/EmbedLang/SentenceID)
-                self._renumber_tokens()
-                self._refresh_sheet_idx_column()
-            elif c == 3:
-                # Gloss
-                self.blocks[bidx][ridx]['gloss'] = nv
+                row['token'] = nv
+                # ids only move if the token turned into (or out of) a meta
+                # row: MatrixLang/EmbedLang/SentenceID/blank
+                if self._is_meta_row_token(ov) != self._is_meta_row_token(nv):
+                    self._mark_renum_dirty(bidx)
+                    self._renumber_tokens()
+                    self._refresh_sheet_idx_column()
             else:
-                # Extra columns
-                hdrs = self._all_headers()
-                if 0 <= c < len(hdrs):
-                    key = hdrs[c]
-                    if key not in ("Token", "Item", "Label", "Gloss"):
-                        self.blocks[bidx][ridx][key] = nv
+                # Gloss / extra columns
+                row[key] = nv
 
             # propagate change to the other sheet (if open)
-            for other in (self.sheet, self._full_sheet):
-                if other is None or other is sheet:
-                    continue
+            other = self._full_sheet if sheet is self.sheet else self.sheet
+            if other is not None:
                 try:
-                    other.set_cell_data(r, c, nv)
-                    if hasattr(other, "refresh"):
-                        other.refresh()
+                    other.set_cell_data(r, c, nv, redraw=False)
                 except Exception:
                     pass
+            self._schedule_refresh()
 
         except Exception:
             pass
@@ -3048,30 +3297,17 @@ VOC vocative
     def _move_cell(self, delta):
         if self.sheet is None:
             return
-        try:
-            sel = self.sheet.get_currently_selected()
-            r = getattr(sel, "row", None) if sel is not None else None
-            c = getattr(sel, "column", None) if sel is not None else None
-            if r is None or c is None:
-                cells = self.sheet.get_selected_cells()
-                if cells:
-                    r, c = list(cells)[0]
-        except Exception:
-            r = c = None
+        r, c = self._get_rc()
         if r is None or c is None:
             return
-        total = self.sheet.total_rows()
-        n = r + delta
-        while 0 <= n < total:
-            if n not in self._sep_rows:
-                try:
-                    self.sheet.select_cell(n, c)
-                    self.sheet.see(n, c)
-                    self._last_pos = (n, c)
-                except Exception:
-                    pass
-                return
-            n += delta
+        n = self._next_real_row(r + delta, delta, self.sheet.total_rows())
+        if n is not None:
+            try:
+                self.sheet.select_cell(n, c)
+                self.sheet.see(n, c)
+                self._last_pos = (n, c)
+            except Exception:
+                pass
 
     def _on_sheet_cell_select(self, event):
         try:
@@ -3088,42 +3324,33 @@ VOC vocative
         except Exception:
             pass
 
-        if r in self._sep_rows:
+        if r is not None and self._is_sep_row(r):
             total = self.sheet.total_rows() if self.sheet is not None else 0
-            n = r + 1
-            while n < total:
-                if n not in self._sep_rows:
-                    try:
-                        self.sheet.select_cell(n, c)
-                        self.sheet.see(n, c)
-                        self._last_pos = (n, c)
-                    except Exception:
-                        pass
-                    return
-                n += 1
+            n = self._next_real_row(r + 1, 1, total)
+            if n is not None:
+                try:
+                    self.sheet.select_cell(n, c)
+                    self.sheet.see(n, c)
+                    self._last_pos = (n, c)
+                except Exception:
+                    pass
 
     def _select_first_cell(self):
         if self.sheet is None:
             return
-        rows = self.sheet.total_rows()
-        for r in range(rows):
-            if r not in self._sep_rows:
-                try:
-                    self.sheet.select_cell(r, 2)  # Label
-                    self.sheet.see(r, 2)
-                    self._last_pos = (r, 2)
-                except Exception:
-                    pass
-                break
+        r = self._first_real_r
+        if r is not None:
+            try:
+                self.sheet.select_cell(r, 2)  # Label
+                self.sheet.see(r, 2)
+                self._last_pos = (r, 2)
+            except Exception:
+                pass
 
     def _first_real_row(self):
         if self.sheet is None:
             return None
-        rows = self.sheet.total_rows()
-        for r in range(rows):
-            if r not in self._sep_rows:
-                return r
-        return None
+        return self._first_real_r
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 # cs_pipeline.py
 
 
+import io
+import multiprocessing
+import os
 import re
 import fasttext
 import stanza
-from functools import lru_cache
+from collections import Counter
+from functools import lru_cache, partial
 
 # Config
 DEFAULTS = {
@@ -29,8 +33,19 @@ MENTION_RE = re.compile(r"@\w+")
 HASHTAG_RE = re.compile(r"#\w+")
 NUMERIC_RE = re.compile(r"^\d+([.,:/-]\d+)*$")
 EMOJI_RE   = re.compile(r"[\U00010000-\U0010ffff]", flags=re.UNICODE)
+# is_other_token'ın tüm kontrolleri tek bir arama olarak: URL/mention/hashtag
+# önekleri, tamamen sayısal veya tamamen kelime-dışı token, ya da herhangi bir
+# yerde emoji.
+_OTHER_RE = re.compile(
+    r"\A(?:(?i:https?://|www\.)\S|[@#]\w|\d+(?:[.,:/-]\d+)*$|[\W_]+\Z)"
+    r"|[\U00010000-\U0010ffff]"
+)
+_CLEAN_RE    = re.compile(r"[^\w’']+")
+_TOKEN_RE    = re.compile(r"\w+['’]?\w*|\w+|['’]")
+_NE_PIECE_RE = re.compile(r"\w+['’]?\w*|\w+")
+
+EN_CONTRACTIONS = frozenset({"s", "re", "ve", "m", "ll", "d", "t"})
 
-EN_CONTRACTIONS = {"s", "re", "ve", "m", "ll", "d", "t"}
 
 DERIV_SUFFIXES = {
     "lık": ("Deriv=LIK", "DerivPOS=NOUN"),
@@ -101,46 +116,238 @@ CASE_ENDINGS = {
 BUFFER_N_ACC = {"nı": "Case=Acc", "ni": "Case=Acc", "nu": "Case=Acc", "nü": "Case=Acc"}
 BUFFER_N_DAT = {"na": "Case=Dat", "ne": "Case=Dat"}
 
+# Ek tabloları üzerinde ters karakter trie'leri: token'ı son karakterinden
+# geriye yürümek, tablo girdisi başına endswith() yerine token'ın bittiği tüm
+# ekleri en uzun ek boyu kadar adımda bulur.
+_END = None  # yük anahtarı; hiçbir zaman bir karakter değil
+
+def _build_suffix_trie(table):
+    root = {}
+    for suf, payload in table.items():
+        node = root
+        for ch in reversed(suf):
+            node = node.setdefault(ch, {})
+        node[_END] = payload
+    return root
+
+def _longest_suffix(trie, s, end=None):
+    """s[:end]'in bittiği en uzun trie ekinin (uzunluk, yük) çifti; yoksa (0, None).
+    end ile çağıran ekleri s'yi yeniden dilimlemeden indeksle soyabilir."""
+    node = trie
+    best_len, best = 0, None
+    if end is None: end = len(s)
+    i = end
+    while i:
+        i -= 1
+        node = node.get(s[i])
+        if node is None:
+            break
+        if _END in node:
+            best_len, best = end - i, node[_END]
+    return best_len, best
+
+def _suffix_lengths(trie, s):
+    """s'nin bittiği tüm trie eklerinin uzunlukları, kısadan uzuna."""
+    node = trie
+    out = []
+    i = len(s)
+    while i:
+        i -= 1
+        node = node.get(s[i])
+        if node is None:
+            break
+        if _END in node:
+            out.append(len(s) - i)
+    return out
+
+_TR_VOWELS  = frozenset("aeıioöuü")
+_AMB_VOWELS = frozenset("ıiuü")  # tek ünlü: 3.tekil iyelik mi belirtme mi belirsiz
+
+_BUFFER_N_TRIE  = _build_suffix_trie({**BUFFER_N_ACC, **BUFFER_N_DAT})
+_CASE_TRIE      = _build_suffix_trie(CASE_ENDINGS)
+_POSS_LONG_TRIE = _build_suffix_trie(POSS_LONG)
+_POSS_SHORT_TRIE = _build_suffix_trie(POSS_SHORT)
+_PLUR_TRIE      = _build_suffix_trie(PLUR)
+_DERIV_TRIE     = _build_suffix_trie(DERIV_SUFFIXES)
+# karışık bir token'ı kapatabilecek tüm ekler (tek harfliler fazla belirsiz)
+_MIXED_SUFFIX_TRIE = _build_suffix_trie({
+    suf: True
+    for table in (CASE_ENDINGS, PLUR, POSS_LONG, POSS_SHORT, DERIV_SUFFIXES, BUFFER_N_ACC, BUFFER_N_DAT)
+    for suf in table
+    if len(suf) >= 2
+})
+
+@lru_cache(maxsize=200_000)
 def is_other_token(tok: str) -> bool:
-    if not tok: return True
-    if URL_RE.match(tok) or MENTION_RE.match(tok) or HASHTAG_RE.match(tok): return True
-    if NUMERIC_RE.match(tok): return True
-    if EMOJI_RE.search(tok): return True
-    if re.fullmatch(r"[\W_]+", tok): return True
-    return False
+    return (not tok) or _OTHER_RE.search(tok) is not None
 
+@lru_cache(maxsize=200_000)
 def clean_token(token: str) -> str:
-    return re.sub(r"[^\w’']+", "", token)
+    return _CLEAN_RE.sub("", token)
+
+@lru_cache(maxsize=200_000)
+def _clean_lower(token: str) -> str:
+    """clean_token(token).lower(): sözlük ve fastText anahtarı; token başına bir kez."""
+    return _CLEAN_RE.sub("", token).lower()
 
 def tokenize(text: str):
-    return re.findall(r"\w+['’]?\w*|\w+|['’]", text)
+    return _TOKEN_RE.findall(text)
+
+def _read_lower_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().lower().split("\n")
+
+def _first_words(lines):
+    """Her satırın ilk sözcüğü; boş satırlar atlanır."""
+    return [ln.split(None, 1)[0] for ln in lines if ln and not ln.isspace()]
+
+@lru_cache(maxsize=200_000)
+def _split_apostrophe(token: str):
+    # Tam olarak bir apostrof (' veya ’) olmalı; iki yanı da boş olmamalı
+    n = token.count("'")
+    if n + token.count("’") != 1:
+        return None, None
+    base, _, suff = token.partition("'" if n else "’")
+    if not base or not suff:
+        return None, None
+    sfx = suff.lower()
+    if sfx in EN_CONTRACTIONS or sfx.endswith("n't"):
+        return None, None
+    return base, suff
+
+@lru_cache(maxsize=4096)
+def _parse_tr_suffixes(suffix: str):
+    """_parse_tr_suffixes_full'ün önbellekli çekirdeği; aynı ek dizisi metinde
+    defalarca geçtiği için yalnızca değişmez (tuple/frozenset) sonuç döndürür."""
+    s = suffix.lower()
+    # end: henüz ayrıştırılmamış önekin uzunluğu; s hiç yeniden dilimlenmez
+    end = len(s)
+    segments_rev, ud, deriv, amb = [], set(), set(), set()
+    progressed = True
+    while progressed and end:
+        progressed = False
+        n, feat = _longest_suffix(_BUFFER_N_TRIE, s, end)
+        if n:
+            segments_rev.append(s[end - n:end]); ud.add(feat); end -= n; progressed = True; continue
+        n, feat = _longest_suffix(_CASE_TRIE, s, end)
+        if n:
+            segments_rev.append(s[end - n:end]); ud.add(feat); end -= n; progressed = True
+    progressed = True
+    while progressed and end:
+        progressed = False
+        n, feats = _longest_suffix(_POSS_LONG_TRIE, s, end)
+        if n:
+            segments_rev.append(s[end - n:end]); ud.update(feats); end -= n; progressed = True; continue
+        n, feats = _longest_suffix(_POSS_SHORT_TRIE, s, end)
+        if n:
+            segments_rev.append(s[end - n:end]); ud.update(feats); end -= n; progressed = True; continue
+        if s[end - 1] in _AMB_VOWELS:
+            segments_rev.append(s[end - 1]); amb.add("Amb=P3sg_or_Acc"); end -= 1; progressed = True
+    n, feat = _longest_suffix(_PLUR_TRIE, s, end)
+    if n:
+        segments_rev.append(s[end - n:end]); ud.add(feat); end -= n
+    progressed = True
+    while progressed and end:
+        progressed = False
+        n, feats = _longest_suffix(_DERIV_TRIE, s, end)
+        if n:
+            segments_rev.append(s[end - n:end]); deriv.update(feats); end -= n; progressed = True
+    if end:
+        segments_rev.append(s[:end]); deriv.add("Unparsed=Leftover")
+    segments_rev.reverse()
+    return tuple(segments_rev), frozenset(ud), frozenset(deriv), frozenset(amb)
 
 class Annotator:
+    # Süreç havuzu isteğe bağlıdır: varsayılan processes=1 (seri). Havuzun
+    # açılış maliyeti (fork/spawn + durum aktarımı) birkaç bin satırlık işten
+    # pahalı olabildiği için yalnızca processes>1 ve en az parallel_min_lines
+    # boş olmayan satırda kullanılır; processes=None -> os.cpu_count().
+    parallel_min_lines = 2000
+    processes = 1
+    # _ft_cache üst sınırı (token -> (dil, olasılık)); dolunca en eski atılır
+    _ft_cache_cap = 200_000
+
     def __init__(self, freq_tr="frequent_tr_words.txt", freq_en="frequent_en_words.txt", ft_path="lid.176.ftz"):
-        self.turkish_freq_top = set()
-        self.turkish_freq_all = set()
-        self.english_freq_words = set()
-        with open(freq_tr, "r", encoding="utf-8") as f:
-            for i, line in enumerate(f):
-                parts = line.strip().split()
-                if not parts: continue
-                w = parts[0].lower()
-                self.turkish_freq_all.add(w)
-                if i < 1000:
-                    self.turkish_freq_top.add(w)
-        with open(freq_en, "r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split()
-                if not parts: continue
-                self.english_freq_words.add(parts[0].lower())
-        self.ft_model = fasttext.load_model(ft_path)
+        # Dosyaları tek seferde okuyup küçük harfe çevir; sözlükler sonradan
+        # hiç değişmediği için frozenset
+        tr_lines = _read_lower_lines(freq_tr)
+        self.turkish_freq_top = frozenset(_first_words(tr_lines[:1000]))
+        self.turkish_freq_all = frozenset(_first_words(tr_lines))
+        self.english_freq_words = frozenset(_first_words(_read_lower_lines(freq_en)))
+        self.ft_path = ft_path  # model ilk ihtiyaçta yüklenir (bkz. ft_model)
+        self._ft_model = None
+        self._ft_cache = {}
         self.ner = None
 
-    @lru_cache(maxsize=200000)
+    @property
+    def ft_model(self):
+        """fastText LID modeli; ilk gerçekten gerektiğinde ft_path'ten yüklenir.
+        Tüm token'lar sözlüklerde bulunursa model hiç yüklenmez."""
+        model = self._ft_model
+        if model is None and self.ft_path:
+            model = self._ft_model = fasttext.load_model(self.ft_path)
+        return model
+
+    @ft_model.setter
+    def ft_model(self, model):
+        self._ft_model = model
+
     def _ft_predict(self, token_l: str):
+        cache = self._ft_cache
+        try:
+            return cache[token_l]
+        except KeyError:
+            pass
         labels, probs = self.ft_model.predict(token_l, k=1)
-        lang = labels[0].replace("__label__", "").upper()
-        return lang, float(probs[0])
+        hit = (labels[0].replace("__label__", "").upper(), float(probs[0]))
+        if len(cache) >= self._ft_cache_cap:
+            del cache[next(iter(cache))]  # FIFO: en eski kayıt
+        cache[token_l] = hit
+        return hit
+
+    def _ft_candidates(self, tokens):
+        """annotate() sırasında _ft_predict'e sorulabilecek tüm dizeleri üretir
+        (token, apostrof tabanı, eksiz karışık aday tabanları). Fazlası zararsız;
+        eksik kalmaması önemli, süreç havuzundaki işçiler bu önbellekle çalışır."""
+        top, en, full = self.turkish_freq_top, self.english_freq_words, self.turkish_freq_all
+        for tok in tokens:
+            if is_other_token(tok): continue
+            tok_l = _clean_lower(tok)
+            top_tr = tok_l in top
+            if not (top_tr or tok_l in en or tok_l in full):
+                yield tok_l
+            # apostrof tabanı etiketten bağımsız olarak choose()'a sorulur
+            base, suf = self._split_mixed_apostrophe(tok)
+            if base and suf:
+                base_l = _clean_lower(base)
+                if not (base_l in top or base_l in en or base_l in full):
+                    yield base_l
+            # eksiz karışık tespiti yalnızca etiket TR değilken çalışır
+            if top_tr: continue
+            low = tok.lower()
+            if low in full: continue
+            for n in _suffix_lengths(_MIXED_SUFFIX_TRIE, low):
+                base_clean = _clean_lower(tok[:-n])
+                if len(base_clean) >= 2 and base_clean not in en:
+                    yield base_clean
+
+    def _ft_prefetch(self, words):
+        """Bilinmeyen dizeleri tek bir toplu fastText çağrısıyla tahmin edip
+        self._ft_cache'e yazar; _ft_predict önce bu önbelleğe bakar."""
+        cache = self._ft_cache
+        pending = [w for w in dict.fromkeys(words) if w and w not in cache]
+        if not pending: return
+        cap = self._ft_cache_cap
+        # sığmayanlar önbelleğe giremez; gerekirse _ft_predict tek tek sorar
+        del pending[cap:]
+        overflow = len(cache) + len(pending) - cap
+        if overflow > 0:
+            # en eski kayıtları toplu at (tek tek pop(next(iter())) O(n²) olur)
+            keep = list(cache.items())[overflow:]
+            cache.clear(); cache.update(keep)
+        labels, probs = self.ft_model.predict(pending, k=1)
+        for w, lb, pr in zip(pending, labels, probs):
+            cache[w] = (lb[0].replace("__label__", "").upper(), float(pr[0]))
 
     def _choose_label(self, token_l: str, cfg):
         if token_l in self.turkish_freq_top:
@@ -155,91 +362,42 @@ class Annotator:
         return "UID"
 
     def _parse_tr_suffixes_full(self, suffix: str):
-        s = suffix.lower()
-        segments_rev, ud, deriv, amb = [], set(), set(), set()
-        progressed = True
-        while progressed and s:
-            progressed = False
-            for end, feat in sorted({**BUFFER_N_ACC, **BUFFER_N_DAT}.items(), key=lambda x: -len(x[0])):
-                if s.endswith(end):
-                    segments_rev.append(s[-len(end):])
-                    ud.add(feat); s = s[:-len(end)]; progressed = True; break
-            if progressed: continue
-            for end, feat in sorted(CASE_ENDINGS.items(), key=lambda x: -len(x[0])):
-                if s.endswith(end):
-                    segments_rev.append(s[-len(end):])
-                    ud.add(feat); s = s[:-len(end)]; progressed = True; break
-        progressed = True
-        while progressed and s:
-            progressed = False
-            for end, feats in sorted(POSS_LONG.items(), key=lambda x: -len(x[0])):
-                if s.endswith(end):
-                    segments_rev.append(s[-len(end):]); ud |= set(feats); s = s[:-len(end)]; progressed = True; break
-            if progressed: continue
-            for end, feats in sorted(POSS_SHORT.items(), key=lambda x: -len(x[0])):
-                if s.endswith(end):
-                    segments_rev.append(s[-len(end):]); ud |= set(feats); s = s[:-len(end)]; progressed = True; break
-            if not progressed:
-                for end in ["ı", "i", "u", "ü"]:
-                    if s.endswith(end):
-                        segments_rev.append(end); amb.add("Amb=P3sg_or_Acc"); s = s[:-1]; progressed = True; break
-        for end, feat in sorted(PLUR.items(), key=lambda x: -len(x[0])):
-            if s.endswith(end):
-                segments_rev.append(end); ud.add(feat); s = s[:-len(end)]; break
-        progressed = True
-        while progressed and s:
-            progressed = False
-            for end, (dtag, dpos) in sorted(DERIV_SUFFIXES.items(), key=lambda x: -len(x[0])):
-                if s.endswith(end):
-                    segments_rev.append(end); deriv.add(dtag); deriv.add(dpos); s = s[:-len(end)]; progressed = True; break
-        if s:
-            segments_rev.append(s); deriv.add("Unparsed=Leftover")
-        segments = list(reversed(segments_rev))
-        return segments, ud, deriv, amb
+        segments, ud, deriv, amb = _parse_tr_suffixes(suffix)
+        return list(segments), ud, deriv, amb
 
     def _split_mixed_apostrophe(self, token: str):
-        if "'" in token or "’" in token:
-            parts = re.split(r"[’']", token)
-            if len(parts) == 2 and parts[0] and parts[1]:
-                base, suff = parts
-                sfx = suff.lower()
-                if sfx in EN_CONTRACTIONS or sfx.endswith("n't"):
-                    return None, None
-                return base, suff
-        return None, None
+        return _split_apostrophe(token)
 
     def _detect_mixed_no_apostrophe(self, token: str, cfg):
         tok = token
         tok_l = tok.lower()
         if tok_l in self.turkish_freq_all:
             return None, None
-        all_suffixes = (set(CASE_ENDINGS.keys()) | set(PLUR.keys()) |
-                        set(POSS_LONG.keys()) | set(POSS_SHORT.keys()) |
-                        set(DERIV_SUFFIXES.keys()) | set(BUFFER_N_ACC.keys()) | set(BUFFER_N_DAT.keys()))
-        for suf in sorted(all_suffixes, key=len, reverse=True):
-            if len(suf) < 2: continue
-            if tok_l.endswith(suf):
-                base = tok[:-len(suf)]
-                base_clean = clean_token(base).lower()
-                if len(base_clean) < 2: continue
-                base_is_en = False
-                if base_clean in self.english_freq_words:
+        en_words, tr_all = self.english_freq_words, self.turkish_freq_all
+        en_min, strict = cfg["FT_EN_MIN"], cfg["MIXED_STRICT"]
+        for n in reversed(_suffix_lengths(_MIXED_SUFFIX_TRIE, tok_l)):
+            suf = tok_l[-n:]
+            base = tok[:-len(suf)]
+            base_clean = _clean_lower(base)
+            if len(base_clean) < 2: continue
+            base_is_en = False
+            if base_clean in en_words:
+                base_is_en = True
+            else:
+                blang, bprob = self._ft_predict(base_clean)
+                if blang == "EN" and bprob >= en_min:
                     base_is_en = True
-                else:
-                    blang, bprob = self._ft_predict(base_clean)
-                    if blang == "EN" and bprob >= cfg["FT_EN_MIN"]:
-                        base_is_en = True
-                if not base_is_en: continue
-                last_char = base_clean[-1] if base_clean else ""
-                last_is_vowel = last_char in "aeıioöuü"
-                if suf[0] in ("y", "n") and not last_is_vowel:
-                    continue
-                segments, ud_feats, deriv, amb = self._parse_tr_suffixes_full(suf)
-                has_ud = bool(ud_feats or deriv or amb)
-                if not has_ud: continue
-                if cfg["MIXED_STRICT"] and base_clean in self.turkish_freq_all:
-                    continue
-                return base, token[-len(suf):]
+            if not base_is_en: continue
+            # kaynaştırma y/n yalnızca ünlüyle biten tabandan sonra gelir
+            first = suf[0]
+            if (first == "y" or first == "n") and base_clean[-1] not in _TR_VOWELS:
+                continue
+            segments, ud_feats, deriv, amb = self._parse_tr_suffixes_full(suf)
+            has_ud = bool(ud_feats or deriv or amb)
+            if not has_ud: continue
+            if strict and base_clean in tr_all:
+                continue
+            return base, token[-len(suf):]
         return None, None
 
     def _build_ne_map(self, doc, line_tokens):
@@ -247,7 +405,7 @@ class Annotator:
         if not getattr(doc, "ents", None): return ne_map
         ne_pieces = set()
         for ent in doc.ents:
-            for piece in re.findall(r"\w+['’]?\w*|\w+", ent.text):
+            for piece in _NE_PIECE_RE.findall(ent.text):
                 if piece: ne_pieces.add(piece)
         for tok in line_tokens:
             if tok in ne_pieces:
@@ -258,6 +416,17 @@ class Annotator:
         if enabled and self.ner is None:
             self.ner = stanza.Pipeline("tr", processors="tokenize,ner", use_gpu=False)
 
+    def _run_ner(self, lines):
+        """Boş olmayan satırları tek bir toplu stanza çağrısıyla işler.
+        Dönüş: {satır_indeksi: doc}. bulk_process yoksa (veya tek satır varsa)
+        satır satır self.ner(line) çağrısına düşer."""
+        idx = [i for i, ln in enumerate(lines) if ln.strip()]
+        if not idx: return {}
+        bulk = getattr(self.ner, "bulk_process", None)
+        if bulk is None or len(idx) == 1:
+            return {i: self.ner(lines[i]) for i in idx}
+        return dict(zip(idx, bulk([lines[i] for i in idx])))
+
     def _decide_matrix_embed(self, labels, cfg):
         """
         Basit ve deterministik kural:
@@ -266,12 +435,13 @@ class Annotator:
               Matrix TR ise: cümlede EN veya MIXED varsa EN, yoksa "-"
               Matrix EN ise: cümlede TR veya MIXED varsa TR, yoksa "-"
         """
+        # Tek geçişte etiket histogramı (C tarafında sayılır)
+        counts = Counter(labels)
+        c_tr, c_en, c_mx = counts["TR"], counts["EN"], counts["MIXED"]
+
         # Matrix
-        score_tr = sum(1 for lb in labels if lb == "TR")
-        score_en = sum(1 for lb in labels if lb == "EN")
-        mixed_cnt = sum(1 for lb in labels if lb == "MIXED")
-        score_tr += cfg["MIXED_TR_WEIGHT"] * mixed_cnt
-        score_en += cfg["MIXED_EN_WEIGHT"] * mixed_cnt
+        score_tr = c_tr + cfg["MIXED_TR_WEIGHT"] * c_mx
+        score_en = c_en + cfg["MIXED_EN_WEIGHT"] * c_mx
 
         # Eşitlikte TR'yi tercih ediyoruz (önceki davranışla uyumlu)
         matrix = "TR" if score_tr >= score_en else "EN"
@@ -279,122 +449,235 @@ class Annotator:
         # Embed kararı
         if matrix == "TR":
             # EN veya MIXED var mı?
-            embed = "EN" if any(lb in ("EN", "MIXED") for lb in labels) else "-"
+            embed = "EN" if (c_en or c_mx) else "-"
         else:
             # TR veya MIXED var mı?
-            embed = "TR" if any(lb in ("TR", "MIXED") for lb in labels) else "-"
+            embed = "TR" if (c_tr or c_mx) else "-"
 
         return matrix, embed
 
-    def annotate(self, text, user_cfg=None):
-        cfg = DEFAULTS.copy()
-        if user_cfg: cfg.update(user_cfg)
-        self._ensure_ner(cfg["NER_ENABLED"])
-
-        lines = text.splitlines()
-        out_lines = []
-        sent_idx = 0
-
-        for raw in lines:
-            line = raw.rstrip("\n")
-            if not line.strip():
-                out_lines.append("")
+    def _label_memos(self, cfg):
+        """Bir çalışma boyunca geçerli (cfg sabit) token başına hatırlayan
+        choose/detect sarmalayıcıları döndürür."""
+        label_memo, mixed_memo = {}, {}
+
+        def choose(token_l):
+            lb = label_memo.get(token_l)
+            if lb is None:
+                lb = label_memo[token_l] = self._choose_label(token_l, cfg)
+            return lb
+
+        def detect(token):
+            hit = mixed_memo.get(token)
+            if hit is None:
+                hit = mixed_memo[token] = self._detect_mixed_no_apostrophe(token, cfg)
+            return hit
+
+        return choose, detect
+
+    def _annotate_line_into(self, write, tokens, ne_map, sent_idx, cfg, choose, detect):
+        # cfg bu çağrı boyunca sabit: token döngüsünde sözlük araması yerine yereller
+        per_item = cfg["FEATURE_LANGUAGE_PER_ITEM"]
+        split_apos = self._split_mixed_apostrophe
+        parse_suffixes = self._parse_tr_suffixes_full
+
+        # Cümle numarası
+        if cfg.get("FEATURE_SENTENCE_ID", True):
+            write(f"SentenceID\t{sent_idx}\n")
+
+        labels_in_sent = []
+        add_label = labels_in_sent.append
+
+        for tok in tokens:
+            if is_other_token(tok):
+                if per_item:
+                    write(tok); write("\tOTHER\n")
                 continue
 
-            # Cümle numarası
-            sent_idx += 1
-            if cfg.get("FEATURE_SENTENCE_ID", True):
-                out_lines.append(f"SentenceID\t{sent_idx}")
-
-            ner_doc = None
-            tokens = tokenize(line)
-            if cfg["NER_ENABLED"]:
-                ner_doc = self.ner(line)
-                ne_map = self._build_ne_map(ner_doc, tokens)
-            else:
-                ne_map = {}
-
-            labels_in_sent = []
-            sent_rows = []
-
-            for tok in tokens:
-                tok_clean = clean_token(tok)
-                if is_other_token(tok):
-                    if cfg["FEATURE_LANGUAGE_PER_ITEM"]:
-                        sent_rows.append(f"{tok}\tOTHER")
-                    continue
-
-                if tok in ne_map:
-                    if cfg["FEATURE_LANGUAGE_PER_ITEM"]:
-                        sent_rows.append(f"{tok}\tNE")
-                        labels_in_sent.append("NE")
-                    continue
-
-                if not cfg["FEATURE_LANGUAGE_PER_ITEM"]:
-                    # sadece matrix/embed için işlem
-                    tok_l = tok_clean.lower()
-                    label = self._choose_label(tok_l, cfg)
-                    base, suf = self._split_mixed_apostrophe(tok)
-                    if base and suf:
-                        base_l = clean_token(base).lower()
-                        base_lb = self._choose_label(base_l, cfg)
-                        if base_lb == "EN":
-                            segments, ud_feats, deriv, amb = self._parse_tr_suffixes_full(suf)
-                            if (ud_feats or deriv or amb):
-                                labels_in_sent.append("MIXED")
-                                continue
-                    if label != "TR":
-                        base2, suf2 = self._detect_mixed_no_apostrophe(tok, cfg)
-                        if base2 and suf2:
-                            labels_in_sent.append("MIXED")
-                            continue
-                    if label in ("TR", "EN"): labels_in_sent.append(label)
-                    continue
-
-                tok_l = tok_clean.lower()
-                label = self._choose_label(tok_l, cfg)
+            if tok in ne_map:
+                if per_item:
+                    write(tok); write("\tNE\n")
+                    add_label("NE")
+                continue
 
-                base, suf = self._split_mixed_apostrophe(tok)
+            tok_l = _clean_lower(tok)
+            if not per_item:
+                # sadece matrix/embed için işlem
+                label = choose(tok_l)
+                base, suf = split_apos(tok)
                 if base and suf:
-                    base_l = clean_token(base).lower()
-                    base_label = self._choose_label(base_l, cfg)
-                    if base_label == "EN":
-                        segments, ud_feats, deriv, amb = self._parse_tr_suffixes_full(suf)
+                    base_l = _clean_lower(base)
+                    base_lb = choose(base_l)
+                    if base_lb == "EN":
+                        segments, ud_feats, deriv, amb = parse_suffixes(suf)
                         if (ud_feats or deriv or amb):
-                            sent_rows.append(f"{tok}\tMIXED")
-                            labels_in_sent.append("MIXED")
+                            add_label("MIXED")
                             continue
-                    if base_label == "TR":
-                        sent_rows.append(f"{tok}\tTR")
-                        labels_in_sent.append("TR")
-                        continue
-
                 if label != "TR":
-                    base2, suf2 = self._detect_mixed_no_apostrophe(tok, cfg)
+                    base2, suf2 = detect(tok)
                     if base2 and suf2:
-                        sent_rows.append(f"{tok}\tMIXED")
-                        labels_in_sent.append("MIXED")
+                        add_label("MIXED")
                         continue
+                if label in ("TR", "EN"): add_label(label)
+                continue
 
-                sent_rows.append(f"{tok}\t{label}")
-                if label in ("TR", "EN", "MIXED"):
-                    labels_in_sent.append(label)
+            label = choose(tok_l)
+
+            base, suf = split_apos(tok)
+            if base and suf:
+                base_l = _clean_lower(base)
+                base_label = choose(base_l)
+                if base_label == "EN":
+                    segments, ud_feats, deriv, amb = parse_suffixes(suf)
+                    if (ud_feats or deriv or amb):
+                        write(tok); write("\tMIXED\n")
+                        add_label("MIXED")
+                        continue
+                if base_label == "TR":
+                    write(tok); write("\tTR\n")
+                    add_label("TR")
+                    continue
 
-            out_lines.extend(sent_rows)
+            if label != "TR":
+                base2, suf2 = detect(tok)
+                if base2 and suf2:
+                    write(tok); write("\tMIXED\n")
+                    add_label("MIXED")
+                    continue
+
+            write(tok); write("\t"); write(label); write("\n")
+            if label in ("TR", "EN", "MIXED"):
+                add_label(label)
 
-            # Matrix/Embed yazımı
-            matrix, embed = self._decide_matrix_embed(labels_in_sent, cfg)
+        # Matrix/Embed yazımı
+        matrix, embed = self._decide_matrix_embed(labels_in_sent, cfg)
 
-            if cfg["FEATURE_MATRIX_LANGUAGE"]:
-                out_lines.append(f"MatrixLang\t{matrix}")
-                if cfg["FEATURE_EMBEDDED_LANGUAGE"]:
-                    # Her zaman yaz
-                    out_lines.append(f"EmbedLang\t{embed}")
+        if cfg["FEATURE_MATRIX_LANGUAGE"]:
+            write(f"MatrixLang\t{matrix}\n")
+            if cfg["FEATURE_EMBEDDED_LANGUAGE"]:
+                # Her zaman yaz
+                write(f"EmbedLang\t{embed}\n")
+        else:
+            # Matrix istenmiyorsa bile Embed seçildiyse yine hesapla ve yaz
+            if cfg["FEATURE_EMBEDDED_LANGUAGE"]:
+                write(f"EmbedLang\t{embed}\n")
+
+        write("\n")
+
+    def _render_line(self, sent_idx, tokens, ne_map, cfg, choose, detect):
+        buf = io.StringIO()
+        self._annotate_line_into(buf.write, tokens, ne_map, sent_idx, cfg, choose, detect)
+        return buf.getvalue()
+
+    def annotate_line(self, line, cfg, ne_map=None, sent_idx=1, memo=None):
+        """Tek bir (boş olmayan) satırın çıktı bloğunu döndürür; son satır
+        sonu dahil. NER/fastText toplu ön geçişleri çağıranın işidir."""
+        cfg = {**DEFAULTS, **(cfg or {})}
+        choose, detect = memo or self._label_memos(cfg)
+        return self._render_line(sent_idx, tokenize(line), ne_map or {}, cfg, choose, detect)
+
+    def _pool_state(self, jobs):
+        # İşçilere bir kez gönderilen, pickle edilebilir durum. fastText
+        # önbelleğinin tamamı (200k'ya kadar kayıt) değil, yalnızca bu
+        # belgenin adayları gönderilir.
+        cache = self._ft_cache
+        needed = {}
+        for job in jobs:
+            for w in self._ft_candidates(job[2]):
+                hit = cache.get(w)
+                if hit is not None:
+                    needed[w] = hit
+        return (self.turkish_freq_top, self.turkish_freq_all, self.english_freq_words,
+                needed, self.ft_path)
+
+    def _annotate_parallel(self, jobs, cfg, processes):
+        """Satırlar birbirinden bağımsız: işleri parçalara bölüp süreç havuzunda
+        işler; jobs ile aynı sırada satır bloklarını döndürür."""
+        size = -(-len(jobs) // (processes * 4))
+        chunks = [[j[1:] for j in jobs[i:i + size]] for i in range(0, len(jobs), size)]
+        processes = min(processes, len(chunks))  # boşta işçi başlatma
+        with multiprocessing.Pool(processes, initializer=_pool_init,
+                                  initargs=(self._pool_state(jobs),)) as pool:
+            parts = pool.map(partial(_pool_annotate, cfg=cfg), chunks)
+        return [block for part in parts for block in part]
+
+    def _line_jobs(self, line_tokens, ner_docs, cfg):
+        # Boş olmayan her satır için (satır_indeksi, cümle_no, token'lar, ne_map);
+        # line_tokens'ta boş satırlar None
+        sent_idx = 0
+        for line_idx, tokens in enumerate(line_tokens):
+            if tokens is None:
+                continue
+            sent_idx += 1
+            if cfg["NER_ENABLED"]:
+                ne_map = self._build_ne_map(ner_docs.get(line_idx), tokens)
             else:
-                # Matrix istenmiyorsa bile Embed seçildiyse yine hesapla ve yaz
-                if cfg["FEATURE_EMBEDDED_LANGUAGE"]:
-                    out_lines.append(f"EmbedLang\t{embed}")
+                ne_map = {}
+            yield line_idx, sent_idx, tokens, ne_map
 
-            out_lines.append("")
+    def annotate_iter(self, text, user_cfg=None):
+        """annotate() çıktısını girdi satırı başına bir parça olarak üretir:
+        cümle bloğu (her satır "\n" ile biter, sondaki boş ayraç dahil) ya da
+        boş girdi satırı için "\n". Parçaların birleşimi annotate() çıktısı +
+        son bir "\n"'dir; fp.writelines(...) ile doğrudan dosyaya yazılabilir."""
+        cfg = DEFAULTS.copy()
+        if user_cfg: cfg.update(user_cfg)
+        self._ensure_ner(cfg["NER_ENABLED"])
 
-        return "\n".join(out_lines)
\ No newline at end of file
+        lines = text.splitlines()
+        # Her satır bir kez token'lara ayrılır; ön geçiş ve satır işleri paylaşır
+        line_tokens = [tokenize(ln) if ln.strip() else None for ln in lines]
+
+        # fastText'i belge başına tek seferde çağır (satır/token başına değil)
+        if self._ft_model is not None or self.ft_path:
+            self._ft_prefetch(
+                w for tokens in line_tokens if tokens is not None
+                for w in self._ft_candidates(tokens)
+            )
+
+        ner_docs = self._run_ner(lines) if cfg["NER_ENABLED"] else {}
+
+        jobs = self._line_jobs(line_tokens, ner_docs, cfg)
+        processes = self.processes or os.cpu_count() or 1
+        if processes > 1 and sum(1 for ln in lines if ln.strip()) >= self.parallel_min_lines:
+            jobs = list(jobs)
+            blocks = zip((j[0] for j in jobs), self._annotate_parallel(jobs, cfg, processes))
+        else:
+            # Seri yol tembel: her satır bloğu üretildiği anda çağırana gider
+            choose, detect = self._label_memos(cfg)
+            blocks = ((j[0], self._render_line(*j[1:], cfg, choose, detect)) for j in jobs)
+
+        prev = -1
+        for line_idx, block in blocks:
+            for _ in range(line_idx - prev - 1):
+                yield "\n"
+            yield block
+            prev = line_idx
+        for _ in range(len(lines) - prev - 1):
+            yield "\n"
+
+    def annotate(self, text, user_cfg=None):
+        # "\n".join(satırlar) ile aynı çıktı: son satır sonu hariç
+        return "".join(self.annotate_iter(text, user_cfg))[:-1]
+
+
+# --- çok süreçli annotate işçileri ---------------------------------------
+_WORKER = None
+
+def _pool_init(state):
+    global _WORKER
+    top, full, en, ft_cache, ft_path = state
+    w = Annotator.__new__(Annotator)
+    w.turkish_freq_top, w.turkish_freq_all, w.english_freq_words = top, full, en
+    w._ft_cache = ft_cache
+    # Ön geçiş gerekli tahminleri önbelleğe koydu; model yalnızca bir
+    # ıskalamada (tembel olarak) yüklenir
+    w._ft_model = None
+    w.ft_path = ft_path
+    w.ner = None
+    _WORKER = w
+
+def _pool_annotate(chunk, cfg):
+    choose, detect = _WORKER._label_memos(cfg)
+    return [_WORKER._render_line(sent_idx, tokens, ne_map, cfg, choose, detect)
+            for sent_idx, tokens, ne_map in chunk]
@@ -43,6 +43,9 @@ def main():
     annotator.turkish_freq_top = {"kitap"}
     annotator.turkish_freq_all = set()
     annotator.english_freq_words = {"amazing", "boss"}
+    annotator.ft_path = None  # no fastText model; _ft_predict is patched below
+    annotator._ft_model = None
+    annotator._ft_cache = {}
 
     cfg = dict(DEFAULTS, NER_ENABLED=False)
 
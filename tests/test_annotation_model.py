@@ -8,11 +8,17 @@ from annotation_model import (
     compute_word_frequencies,
     sheet_rows_to_txt,
     renumber_tokens,
+    renumber_tokens_from,
+    iter_annotated_blocks,
     reconstruct_text_from_blocks,
     is_matrixembed_locked,
     iter_visible_rows,
+    iter_visible_rows_from_arrays,
     resolve_row,
     build_grid_view,
+    build_grid_arrays,
+    row_index_map_from_arrays,
+    shift_grid_arrays,
 )
 
 
@@ -368,6 +374,99 @@ def test_renumber_tokens_mutates_blocks_in_place():
     assert row_obj["idx"] == 1
 
 
+def _rt_blocks():
+    return [
+        [_rt_row("SentenceID"), _rt_row("a", "TR"), _rt_row("b", "EN")],
+        [_rt_row("c", "TR"), _rt_row("MatrixLang")],
+        [_rt_row("d", "EN"), _rt_row("e", "TR")],
+    ]
+
+
+def _idx(blocks):
+    return [[r["idx"] for r in blk] for blk in blocks]
+
+
+def test_renumber_tokens_from_records_first_id_per_block():
+    blocks = _rt_blocks()
+    g_at = []
+    renumber_tokens_from(blocks, g_at)
+    assert g_at == [1, 3, 4]
+    assert _idx(blocks) == [["", 1, 2], [3, ""], [4, 5]]
+
+
+@pytest.mark.parametrize("edit", [
+    lambda blocks: blocks[1].insert(0, _rt_row("new", "TR")),
+    lambda blocks: blocks[1][1].update(token="x"),
+    lambda blocks: blocks[2].pop(0),
+    lambda blocks: blocks.pop(1),
+], ids=["insert_row", "meta_to_token", "remove_row", "remove_block"])
+def test_renumber_tokens_from_dirty_block_matches_full_pass(edit):
+    blocks = _rt_blocks()
+    g_at = []
+    renumber_tokens_from(blocks, g_at)
+
+    edit(blocks)
+    renumber_tokens_from(blocks, g_at, 1)
+
+    expected = copy.deepcopy(blocks)
+    expected_g_at = []
+    renumber_tokens_from(expected, expected_g_at)
+    assert _idx(blocks) == _idx(expected)
+    assert g_at == expected_g_at
+
+
+def test_renumber_tokens_from_without_prefix_falls_back_to_full_pass():
+    blocks = _rt_blocks()
+    g_at = []
+    renumber_tokens_from(blocks, g_at, 2)
+    assert _idx(blocks) == [["", 1, 2], [3, ""], [4, 5]]
+    assert g_at == [1, 3, 4]
+
+
+# --- iter_annotated_blocks ---------------------------------------------
+
+def _tokens(blocks):
+    return [[r["token"] for r in blk] for blk in blocks]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", [[]]),
+    ("a\tTR\nb\tEN", [["a", "b"]]),
+    ("a\tTR\n\nb\tEN", [["a"], ["b"]]),
+    # same boundaries as text.split("\n\n")
+    ("a\tTR\n\n\nb\tEN", [["a"], ["b"]]),
+    ("a\tTR\n\n\n\nb\tEN", [["a"], [], ["b"]]),
+    ("\n\na\tTR", [[], ["a"]]),
+    ("a\tTR\n\n", [["a"], []]),
+    # CRLF blank lines are not boundaries for split("\n\n") either
+    ("a\tTR\r\n\r\nb\tEN", [["a", "b"]]),
+], ids=["empty", "one_block", "two_blocks", "three_newlines", "four_newlines",
+        "leading_boundary", "trailing_boundary", "crlf"])
+def test_iter_annotated_blocks_block_boundaries(text, expected):
+    assert _tokens(iter_annotated_blocks(text, [])) == expected
+
+
+def test_iter_annotated_blocks_row_formats():
+    text = "\n".join([
+        "Bugun\tTR",          # token<TAB>label
+        "2\tmeeting'e\tMIXED\tgloss",  # idx<TAB>token<TAB>label...
+        "think EN",           # whitespace-separated fallback
+        "no label here",      # not a row
+        "   ",
+    ])
+    (rows,) = list(iter_annotated_blocks(text, ["Note"]))
+    assert rows == [
+        {"idx": 0, "token": "Bugun", "label": "TR", "gloss": "", "Note": ""},
+        {"idx": 0, "token": "meeting'e", "label": "MIXED", "gloss": "", "Note": ""},
+        {"idx": 0, "token": "think", "label": "EN", "gloss": "", "Note": ""},
+    ]
+
+
+def test_iter_annotated_blocks_is_lazy():
+    it = iter_annotated_blocks("a\tTR\n\nb\tEN", [])
+    assert _tokens([next(it)]) == [["a"]]
+
+
 # --- reconstruct_text_from_blocks ------------------------------------------
 
 _RECONSTRUCT_CASES = [
@@ -557,6 +656,17 @@ def test_iter_visible_rows_unresolved_rows_not_in_sep_rows():
     assert result == [(0, 0, 0, blocks[0][0])]
 
 
+def test_iter_visible_rows_from_arrays_matches_dict_view():
+    blocks = [[_row("a", "TR"), _row("b", "EN")], [], [_row("c", "MIXED")]]
+    data, row_bidx, row_ridx, sep_rows = build_grid_arrays(blocks, [], False)
+    flags = bytearray(len(data))
+    for r in sep_rows:
+        flags[r] = 1
+    expected = list(iter_visible_rows(blocks, row_index_map_from_arrays(row_bidx, row_ridx), sep_rows))
+    assert list(iter_visible_rows_from_arrays(blocks, row_bidx, row_ridx, flags)) == expected
+    assert list(iter_visible_rows_from_arrays(blocks, row_bidx, row_ridx)) == expected
+
+
 def test_iter_visible_rows_empty_mappings():
     assert list(iter_visible_rows([], {}, set())) == []
 
@@ -795,3 +905,86 @@ def test_build_grid_view_custom_header_backfill_and_mutation():
     assert data == [["", "a", "TR", "", "", ""], ["", "b", "EN", "", "", ""]]
     assert row_index_map == {0: (0, 0), 1: (0, 1)}
     assert sep_rows == set()
+
+
+# --- build_grid_arrays -------------------------------------------------
+
+def test_build_grid_arrays_uses_minus_one_for_separator_rows():
+    blocks = [[_row("a", "TR"), _row("b", "EN")], [_row("c", "TR")]]
+    data, row_bidx, row_ridx, sep_rows = build_grid_arrays(blocks, [], skip_separator_after_empty_block=False)
+    assert list(row_bidx) == [0, 0, -1, 1]
+    assert list(row_ridx) == [0, 1, -1, 0]
+    assert sep_rows == {2}
+    assert len(data) == len(row_bidx) == len(row_ridx)
+
+
+def test_build_grid_arrays_agrees_with_build_grid_view():
+    blocks = [[_row("a", "TR")], [], [_row("b", "EN"), _row("c", "TR")]]
+    for skip in (False, True):
+        data, row_bidx, row_ridx, sep_rows = build_grid_arrays(copy.deepcopy(blocks), ["X"], skip)
+        v_data, v_map, v_sep = build_grid_view(copy.deepcopy(blocks), ["X"], skip)
+        assert data == v_data
+        assert row_index_map_from_arrays(row_bidx, row_ridx) == v_map
+        assert sep_rows == v_sep
+
+
+# --- shift_grid_arrays -------------------------------------------------
+
+def _shift_blocks():
+    return [
+        [_row("a", "TR"), _row("b", "EN"), _row("c", "TR")],
+        [_row("d", "EN")],
+        [_row("e", "TR"), _row("f", "TR")],
+    ]
+
+
+def _row_of(row_bidx, row_ridx, bidx, ridx):
+    return next(r for r in range(len(row_bidx)) if (row_bidx[r], row_ridx[r]) == (bidx, ridx))
+
+
+@pytest.mark.parametrize("bidx, ridx", [(0, 0), (0, 2), (1, 0), (2, 1)],
+                         ids=["first_row", "last_row_of_block", "single_row_block", "last_block"])
+def test_shift_grid_arrays_insert_matches_full_rebuild(bidx, ridx):
+    blocks = _shift_blocks()
+    _, row_bidx, row_ridx, sep_rows = build_grid_arrays(blocks, [], skip_separator_after_empty_block=False)
+    at_row = _row_of(row_bidx, row_ridx, bidx, ridx)
+
+    blocks[bidx].insert(ridx, _row(""))
+    shift_grid_arrays(row_bidx, row_ridx, sep_rows, at_row, +1, bidx, ridx)
+
+    _, exp_bidx, exp_ridx, exp_sep = build_grid_arrays(blocks, [], skip_separator_after_empty_block=False)
+    assert row_bidx == exp_bidx
+    assert row_ridx == exp_ridx
+    assert sep_rows == exp_sep
+
+
+@pytest.mark.parametrize("bidx, ridx", [(0, 0), (0, 1), (0, 2), (2, 0), (2, 1)],
+                         ids=["first_row", "middle_row", "last_row_of_block",
+                              "last_block_first_row", "very_last_row"])
+def test_shift_grid_arrays_remove_matches_full_rebuild(bidx, ridx):
+    blocks = _shift_blocks()
+    _, row_bidx, row_ridx, sep_rows = build_grid_arrays(blocks, [], skip_separator_after_empty_block=False)
+    at_row = _row_of(row_bidx, row_ridx, bidx, ridx)
+
+    del blocks[bidx][ridx]
+    shift_grid_arrays(row_bidx, row_ridx, sep_rows, at_row, -1, bidx)
+
+    _, exp_bidx, exp_ridx, exp_sep = build_grid_arrays(blocks, [], skip_separator_after_empty_block=False)
+    assert row_bidx == exp_bidx
+    assert row_ridx == exp_ridx
+    assert sep_rows == exp_sep
+
+
+def test_shift_grid_arrays_mutates_in_place_and_returns_none():
+    row_bidx, row_ridx, sep_rows = [0, -1, 1], [0, -1, 0], {1}
+    assert shift_grid_arrays(row_bidx, row_ridx, sep_rows, 0, -1, 0) is None
+    assert row_bidx == [-1, 1]
+    assert row_ridx == [-1, 0]
+    assert sep_rows == {0}
+
+
+def test_shift_grid_arrays_accepts_no_sep_rows():
+    row_bidx, row_ridx = [0, 0, -1, 1], [0, 1, -1, 0]
+    shift_grid_arrays(row_bidx, row_ridx, None, 1, +1, 0, 1)
+    assert row_bidx == [0, 0, 0, -1, 1]
+    assert row_ridx == [0, 1, 2, -1, 0]
@@ -8,11 +8,15 @@ from cs_pipeline import Annotator, DEFAULTS, tokenize
 
 def _make_annotator(turkish_top=(), turkish_all=(), english_words=()):
     # Bypass __init__ entirely -- no frequency-file reads, no
-    # fasttext.load_model() call. _choose_label only needs these three sets.
+    # fasttext.load_model() call. _choose_label only needs these three sets;
+    # the fastText slots __init__ would set start empty (no model path).
     obj = Annotator.__new__(Annotator)
     obj.turkish_freq_top = set(turkish_top)
     obj.turkish_freq_all = set(turkish_all)
     obj.english_freq_words = set(english_words)
+    obj.ft_path = None
+    obj._ft_model = None
+    obj._ft_cache = {}
     return obj
 
 
@@ -103,6 +107,71 @@ def test_choose_label_lexicon_hit_never_calls_ft_predict(make_obj, token):
     mocked.assert_not_called()
 
 
+# --- batched fastText prefetch -----------------------------------------------
+
+def test_annotate_batches_fasttext_into_one_predict_call():
+    obj = _make_annotator(turkish_top={"bugun"})
+    obj.ner = lambda line: _FakeDoc([])
+    obj._ft_cache = {}
+    obj.ft_model = mock.Mock()
+    obj.ft_model.predict.side_effect = lambda words, k=1: (
+        [["__label__en"] for _ in words], [[0.9] for _ in words])
+    cfg = dict(DEFAULTS, NER_ENABLED=False)
+    out = obj.annotate("bugun hello\nhello world", cfg)
+
+    obj.ft_model.predict.assert_called_once()
+    batch = obj.ft_model.predict.call_args.args[0]
+    assert batch.count("hello") == 1           # duplicates collapsed
+    assert "bugun" not in batch                # lexicon hits never sent
+    assert obj._ft_cache["world"] == ("EN", 0.9)
+    assert "hello\tEN" in out and "world\tEN" in out
+
+
+def test_ft_predict_caches_and_evicts_oldest_at_cap():
+    obj = _make_annotator()
+    obj._ft_cache_cap = 2
+    obj.ft_model = mock.Mock()
+    obj.ft_model.predict.return_value = (["__label__tr"], [0.7])
+    for w in ("a", "b", "a", "c"):
+        assert obj._ft_predict(w) == ("TR", 0.7)
+    assert obj.ft_model.predict.call_count == 3    # second "a" was a hit
+    assert list(obj._ft_cache) == ["b", "c"]       # "a" evicted first-in
+
+
+def test_ft_prefetch_never_grows_cache_past_cap():
+    obj = _make_annotator()
+    obj._ft_cache_cap = 3
+    obj._ft_cache = {"old": ("TR", 0.5)}
+    obj.ft_model = mock.Mock()
+    obj.ft_model.predict.side_effect = lambda words, k=1: (
+        [["__label__en"] for _ in words], [[0.9] for _ in words])
+    obj._ft_prefetch(["a", "b", "c", "d", "e"])
+    assert obj.ft_model.predict.call_args.args[0] == ["a", "b", "c"]
+    assert list(obj._ft_cache) == ["a", "b", "c"]
+
+
+def test_ft_candidates_include_apostrophe_base_of_top_list_token():
+    # "bugun'de" is itself a top-1000 token, but annotate still asks
+    # choose() about its apostrophe base, so the prefetch must cover it
+    obj = _make_annotator(turkish_top={"bugun'de"})
+    assert list(obj._ft_candidates(["bugun'de"])) == ["bugun"]
+
+
+def test_fasttext_model_loaded_lazily_only_when_needed():
+    obj = _make_annotator(turkish_top={"bugun"})
+    obj.ft_path = "lid.176.ftz"
+    cfg = dict(DEFAULTS, NER_ENABLED=False)
+    fake = mock.Mock()
+    fake.predict.side_effect = lambda words, k=1: (
+        [["__label__en"] for _ in words], [[0.9] for _ in words])
+    with mock.patch.object(cs_pipeline.fasttext, "load_model", return_value=fake) as load:
+        obj.annotate("bugun", cfg)
+        load.assert_not_called()               # lexicon hits only
+        obj.annotate("bugun hello", cfg)
+        obj.annotate("hello world", cfg)
+    load.assert_called_once_with("lid.176.ftz")
+
+
 # --- _split_mixed_apostrophe ------------------------------------------------
 # Neither this function nor _parse_tr_suffixes_full touches `self` at all, so
 # a bare Annotator.__new__() instance with no attributes set is sufficient.
@@ -114,10 +183,11 @@ def test_choose_label_lexicon_hit_never_calls_ft_predict(make_obj, token):
     ("'twas", (None, None)),              # leading apostrophe -> empty first part
     ("word'", (None, None)),              # trailing apostrophe -> empty second part
     ("a'b'c", (None, None)),              # 2+ apostrophes -> more than 2 parts
+    ("a’b'c", (None, None)),              # mixed straight + curly still counts as 2
 ], ids=[
     "straight_apostrophe_split", "curly_apostrophe_split", "no_apostrophe",
     "leading_apostrophe_empty_base", "trailing_apostrophe_empty_suffix",
-    "multiple_apostrophes",
+    "multiple_apostrophes", "mixed_apostrophe_kinds",
 ])
 def test_split_mixed_apostrophe(token, expected):
     obj = _make_annotator()
@@ -139,9 +209,9 @@ def test_split_mixed_apostrophe_contraction_check_is_case_insensitive():
 
 def test_split_mixed_apostrophe_nt_branch_is_unreachable():
     # Documents a confirmed dead branch: `sfx.endswith("n't")` can never be
-    # True, because re.split(r"[’']", token) splits on every apostrophe,
-    # so the suffix half can never itself contain an apostrophe when exactly
-    # 2 parts result (the precondition to reach this check at all). Real
+    # True, because a split is only attempted when the token holds exactly
+    # one apostrophe (' or ’), so the suffix half can never itself contain
+    # an apostrophe (the precondition to reach this check at all). Real
     # contractions like "don't" split to suffix "t", already caught by the
     # EN_CONTRACTIONS set membership check. Not a bug to fix here -- locking
     # in the current, verified behavior.
@@ -195,6 +265,18 @@ def test_parse_tr_suffixes_full_ambiguous_vowel_branch_is_reachable(suffix):
     assert amb == {"Amb=P3sg_or_Acc"}
 
 
+def test_parse_tr_suffixes_full_cached_core_is_shared_and_immutable():
+    # The module-level core is memoized per suffix, so it returns immutable
+    # containers; the method hands callers a fresh segments list each time.
+    core = cs_pipeline._parse_tr_suffixes("lıkları")
+    assert core is cs_pipeline._parse_tr_suffixes("lıkları")
+    assert isinstance(core[1], frozenset)
+    obj = _make_annotator()
+    first = obj._parse_tr_suffixes_full("lıkları")[0]
+    first.append("x")
+    assert obj._parse_tr_suffixes_full("lıkları")[0] == ["lık", "lar", "ı"]
+
+
 # --- _detect_mixed_no_apostrophe --------------------------------------------
 # Uses Annotator.__new__(Annotator) + synthetic turkish_freq_all /
 # english_freq_words, and mock.patch.object for _ft_predict, matching the
@@ -636,12 +718,23 @@ def test_annotate_ner_disabled_never_calls_self_ner():
     ner_mock.assert_not_called()
 
 
-def test_annotate_ner_enabled_called_once_per_nonblank_line():
+def test_annotate_ner_bulk_processes_nonblank_lines_once():
     obj = _make_annotator(turkish_top={"bugun", "gunaydin"})
-    ner_mock = mock.Mock(return_value=_FakeDoc([]))
+    ner_mock = mock.Mock()
+    ner_mock.bulk_process.return_value = [_FakeDoc([]), _FakeDoc([])]
     obj.ner = ner_mock
     with mock.patch.object(obj, "_ft_predict", return_value=("UID", 0.0)):
         obj.annotate("bugun\n\ngunaydin", DEFAULTS)  # NER_ENABLED defaults True
+    ner_mock.bulk_process.assert_called_once_with(["bugun", "gunaydin"])
+    ner_mock.assert_not_called()
+
+
+def test_annotate_ner_without_bulk_process_called_once_per_nonblank_line():
+    obj = _make_annotator(turkish_top={"bugun", "gunaydin"})
+    ner_mock = mock.Mock(spec=["__call__"], return_value=_FakeDoc([]))
+    obj.ner = ner_mock
+    with mock.patch.object(obj, "_ft_predict", return_value=("UID", 0.0)):
+        obj.annotate("bugun\n\ngunaydin", DEFAULTS)
     assert ner_mock.call_count == 2
     ner_mock.assert_has_calls([mock.call("bugun"), mock.call("gunaydin")])
 
@@ -784,6 +877,14 @@ def test_annotate_apostrophe_split_non_qualifying_falls_through():
     mocked_detect.assert_called_once_with("weird'zzz", _CFG_NO_NER)
 
 
+def test_annotate_memoizes_choose_label_per_distinct_token():
+    obj = _make_annotator()
+    with mock.patch.object(obj, "_choose_label", return_value="TR") as mocked_choose:
+        out = obj.annotate("ev ev\nev", _CFG_NO_NER)
+    assert out.count("ev\tTR") == 3
+    mocked_choose.assert_called_once_with("ev", _CFG_NO_NER)
+
+
 # -- Non-apostrophe MIXED --
 
 def test_annotate_non_apostrophe_mixed_produces_mixed_row():
@@ -898,6 +999,24 @@ def test_annotate_representative_tr_en_mixed_sentence_exact_output():
     )
 
 
+# --- is_other_token() ----------------------------------------------------
+# One combined regex replaces the separate URL/mention/hashtag/numeric/
+# emoji/non-word checks; these cases pin each former check's semantics.
+
+@pytest.mark.parametrize("tok, expected", [
+    ("", True),
+    ("https://x.co", True), ("HTTP://x", True), ("www.site", True),
+    ("http://", False),          # URL prefix needs at least one more char
+    ("@user", True), ("#tag", True), ("@", True), ("a@b", False),
+    ("2024", True), ("12.5", True), ("1/2/3", True), ("12a", False), ("1.", False),
+    ("hi😀", True),               # emoji anywhere in the token
+    ("...", True), ("_", True), ("'", True),
+    ("merhaba", False), ("meeting'e", False), ("şçğ", False),
+])
+def test_is_other_token(tok, expected):
+    assert cs_pipeline.is_other_token(tok) is expected
+
+
 # --- tokenize() ----------------------------------------------------------
 # Module-level, pure regex function: r"\w+['’]?\w*|\w+|['’]". No Annotator
 # instance needed at all. Only current, verified regex behavior is tested
@@ -994,10 +1113,7 @@ def test_tokenize_returns_a_list_of_strings():
 # its own dedicated, more detailed unit tests elsewhere in this file.
 
 def test_annotate_end_to_end_smoke_tr_en_mixed_sentence():
-    obj = Annotator.__new__(Annotator)
-    obj.turkish_freq_top = {"kitap"}
-    obj.turkish_freq_all = set()
-    obj.english_freq_words = {"amazing", "boss"}
+    obj = _make_annotator(turkish_top={"kitap"}, english_words={"amazing", "boss"})
 
     cfg = dict(DEFAULTS, NER_ENABLED=False)
     with mock.patch.object(obj, "_ft_predict", return_value=("UID", 0.0)):
@@ -1014,10 +1130,7 @@ def test_annotate_end_to_end_smoke_tr_en_mixed_sentence():
 
 
 def test_annotate_end_to_end_smoke_multiline_independent_sentences():
-    obj = Annotator.__new__(Annotator)
-    obj.turkish_freq_top = {"kitap"}
-    obj.turkish_freq_all = set()
-    obj.english_freq_words = {"amazing", "boss"}
+    obj = _make_annotator(turkish_top={"kitap"}, english_words={"amazing", "boss"})
 
     cfg = dict(DEFAULTS, NER_ENABLED=False)
     with mock.patch.object(obj, "_ft_predict", return_value=("UID", 0.0)):
@@ -1035,3 +1148,85 @@ def test_annotate_end_to_end_smoke_multiline_independent_sentences():
         "MatrixLang\tTR\n"
         "EmbedLang\tEN\n"
     )
+
+
+# --- multiprocessing path ----------------------------------------------------
+# Workers only get the lexicons and the prefetched fastText cache (no model
+# here), so matching the serial output also proves _ft_candidates covered
+# every string annotate() asks _ft_predict about.
+
+def _make_prefetching_annotator():
+    obj = _make_annotator(turkish_top={"bugun", "kitap"}, english_words={"amazing", "boss"})
+    obj._ft_cache = {}
+    obj.ft_model = mock.Mock()
+    obj.ft_model.predict.side_effect = lambda words, k=1: (
+        [["__label__en"] for _ in words], [[0.9] for _ in words])
+    return obj
+
+
+def test_annotate_process_pool_matches_serial_output():
+    text = "bugun meeting'e gitmem\nhello world 2024\n\nkitap amazing boss'um\nstressim @user"
+    cfg = dict(DEFAULTS, NER_ENABLED=False)
+
+    serial = _make_prefetching_annotator()
+    serial.processes = 1
+    expected = serial.annotate(text, cfg)
+
+    parallel = _make_prefetching_annotator()
+    parallel.processes, parallel.parallel_min_lines = 2, 1
+    pool_cls = cs_pipeline.multiprocessing.Pool
+    with mock.patch.object(cs_pipeline.multiprocessing, "Pool", wraps=pool_cls) as spy:
+        out = parallel.annotate(text, cfg)
+    spy.assert_called_once()
+    assert out == expected
+
+
+def test_annotate_process_pool_is_opt_in():
+    obj = _make_prefetching_annotator()
+    obj.parallel_min_lines = 1            # long enough, but processes defaults to 1
+    with mock.patch.object(cs_pipeline.multiprocessing, "Pool") as pool:
+        obj.annotate("bugun\nkitap", dict(DEFAULTS, NER_ENABLED=False))
+    pool.assert_not_called()
+
+
+def test_annotate_process_pool_never_starts_more_workers_than_chunks():
+    obj = _make_prefetching_annotator()
+    obj.processes, obj.parallel_min_lines = 8, 1
+    pool_cls = cs_pipeline.multiprocessing.Pool
+    with mock.patch.object(cs_pipeline.multiprocessing, "Pool", wraps=pool_cls) as spy:
+        obj.annotate("bugun\nkitap", dict(DEFAULTS, NER_ENABLED=False))
+    assert spy.call_args.args[0] == 2
+
+
+def test_annotate_line_fills_missing_cfg_keys_from_defaults():
+    obj = _make_annotator(turkish_top={"kitap"})
+    block = obj.annotate_line("kitap", {"NER_ENABLED": False})
+    assert block == "SentenceID\t1\nkitap\tTR\nMatrixLang\tTR\nEmbedLang\t-\n\n"
+
+
+def test_annotate_line_matches_annotate_block():
+    obj = _make_annotator(turkish_top={"kitap"}, english_words={"amazing"})
+    with mock.patch.object(obj, "_ft_predict", return_value=("UID", 0.0)):
+        block = obj.annotate_line("kitap amazing", _CFG_NO_NER, sent_idx=3)
+    assert block == "SentenceID\t3\nkitap\tTR\namazing\tEN\nMatrixLang\tTR\nEmbedLang\tEN\n\n"
+
+
+# --- annotate_iter() ---------------------------------------------------------
+
+def test_annotate_iter_yields_one_chunk_per_input_line():
+    obj = _make_annotator(turkish_top={"bugun", "kitap"})
+    text = "bugun\n\n\nkitap\n"
+    with mock.patch.object(obj, "_ft_predict", return_value=("UID", 0.0)):
+        chunks = list(obj.annotate_iter(text, _CFG_NO_NER))
+        whole = obj.annotate(text, _CFG_NO_NER)
+    assert len(chunks) == len(text.splitlines())
+    assert chunks[1] == chunks[2] == "\n"
+    assert "".join(chunks) == whole + "\n"
+
+
+def test_annotate_iter_renders_lines_lazily():
+    obj = _make_annotator(turkish_top={"bugun", "kitap"})
+    with mock.patch.object(obj, "_choose_label", return_value="TR") as mocked_choose:
+        it = obj.annotate_iter("bugun\nkitap", _CFG_NO_NER)
+        assert next(it).startswith("SentenceID\t1\nbugun\tTR\n")
+        mocked_choose.assert_called_once_with("bugun", _CFG_NO_NER)